@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+apply() Paralelo por Chunks para Funciones Fila a Fila
+======================================================
+
+Algunas reglas de negocio (p. ej. ``evaluar_calidad_venta`` o
+``calcular_comision`` del material de transformación) son difíciles de
+vectorizar y terminan en ``DataFrame.apply(axis=1)``, que usa un solo núcleo.
+
+``apply_paralelo``:
+
+1. Mide el costo por fila sobre una muestra (cuyo resultado se reutiliza)
+2. Si el trabajo estimado es pequeño, continúa en serie
+3. Si no, divide el resto en chunks contiguos de duración objetivo y los
+   procesa en un ``ProcessPoolExecutor``
+4. Reensambla los resultados en el orden original
+
+La función debe poder serializarse con pickle (definida a nivel de módulo,
+no una lambda).
+
+Ejemplo:
+    ventas['calidad_venta'] = apply_paralelo(ventas, evaluar_calidad_venta)
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+FILAS_MUESTRA = 200
+UMBRAL_SERIAL_S = 0.5      # Por debajo de este tiempo estimado no vale la pena paralelizar
+DURACION_CHUNK_S = 0.25    # Duración objetivo de cada chunk en un proceso
+CHUNKS_POR_PROCESO = 4     # Mínimo de chunks por proceso para balancear carga
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+def _aplicar_chunk(argumentos):
+    """Se ejecuta en el proceso hijo."""
+    chunk, funcion, kwargs = argumentos
+    return chunk.apply(funcion, axis=1, **kwargs)
+
+
+def _concatenar(partes):
+    partes = [p for p in partes if len(p)]
+    if not partes:
+        return pd.Series(dtype=object)
+    return pd.concat(partes)
+
+
+def estimar_chunk(costo_fila, n_filas, n_procesos, duracion_objetivo=DURACION_CHUNK_S):
+    """Tamaño de chunk para ~``duracion_objetivo`` s, con al menos varios chunks por proceso."""
+    por_duracion = max(1, int(duracion_objetivo / max(costo_fila, 1e-9)))
+    por_balance = max(1, math.ceil(n_filas / (n_procesos * CHUNKS_POR_PROCESO)))
+    return min(por_duracion, por_balance)
+
+
+def apply_paralelo(df, funcion, n_procesos=None, tam_chunk=None, filas_muestra=FILAS_MUESTRA,
+                   umbral_serial_s=UMBRAL_SERIAL_S, verbose=False, **kwargs):
+    """
+    Equivalente a ``df.apply(funcion, axis=1, **kwargs)`` usando varios procesos.
+
+    Si ``tam_chunk`` no se indica se calcula a partir del costo medido en la
+    muestra. Devuelve una Series (o DataFrame) con el mismo índice que ``df``.
+    """
+    n_procesos = n_procesos or os.cpu_count() or 1
+    if len(df) == 0:
+        return df.apply(funcion, axis=1, **kwargs)
+
+    muestra = df.iloc[:filas_muestra]
+    inicio = time.perf_counter()
+    resultado_muestra = muestra.apply(funcion, axis=1, **kwargs)
+    costo_fila = (time.perf_counter() - inicio) / len(muestra)
+
+    resto = df.iloc[filas_muestra:]
+    estimado = costo_fila * len(resto)
+    if n_procesos == 1 or len(resto) == 0 or estimado < umbral_serial_s:
+        if verbose:
+            print(f"  apply_paralelo: serie (estimado {estimado:.2f} s, {n_procesos} proceso(s))")
+        return _concatenar([resultado_muestra, resto.apply(funcion, axis=1, **kwargs)])
+
+    tam_chunk = tam_chunk or estimar_chunk(costo_fila, len(resto), n_procesos)
+    limites = range(0, len(resto), tam_chunk)
+    if verbose:
+        print(f"  apply_paralelo: {len(limites)} chunks de {tam_chunk} filas en "
+              f"{n_procesos} procesos (estimado serie {estimado:.2f} s)")
+
+    tareas = ((resto.iloc[i:i + tam_chunk], funcion, kwargs) for i in limites)
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        # map() conserva el orden de envío, así que el índice queda como el original
+        partes = list(ejecutor.map(_aplicar_chunk, tareas))
+    return _concatenar([resultado_muestra] + partes)
+
+# ============================================================================
+# FUNCIONES DE EJEMPLO (material de creación de columnas)
+# ============================================================================
+
+def calcular_comision(row):
+    """Comisión del vendedor: 5% base más bonus por segmento."""
+    base = row['ingresos_netos'] * 0.05
+    if row['segmento_venta'] == 'Premium':
+        bonus = row['ingresos_netos'] * 0.02
+    elif row['segmento_venta'] == 'Alta':
+        bonus = row['ingresos_netos'] * 0.01
+    else:
+        bonus = 0
+    return base + bonus
+
+
+def evaluar_calidad_venta(row):
+    """Clasificación de la venta por tamaño, margen y descuento."""
+    score = 0
+
+    if row['ingresos_netos'] > 50000:
+        score += 3
+    elif row['ingresos_netos'] > 25000:
+        score += 2
+    else:
+        score += 1
+
+    if row['margen_beneficio_pct'] > 35:
+        score += 2
+    elif row['margen_beneficio_pct'] > 25:
+        score += 1
+
+    if row['descuento_pct'] > 10:
+        score -= 1
+
+    if score >= 5:
+        return 'Excelente'
+    elif score >= 3:
+        return 'Buena'
+    else:
+        return 'Regular'
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def crear_ventas(n_ventas, semilla=42):
+    """Ventas sintéticas con las columnas que usan las funciones de ejemplo."""
+    rng = np.random.default_rng(semilla)
+    ventas = pd.DataFrame({
+        'venta_id': [f'V{i:07d}' for i in range(1, n_ventas + 1)],
+        'ingresos_netos': rng.gamma(2.0, 15000, n_ventas).round(2),
+        'margen_beneficio_pct': rng.normal(30, 8, n_ventas).round(1),
+        'descuento_pct': rng.choice([0, 5, 10, 15, 20], n_ventas),
+    })
+    ventas['segmento_venta'] = pd.cut(
+        ventas['ingresos_netos'], bins=[0, 20000, 50000, np.inf],
+        labels=['Estándar', 'Alta', 'Premium']
+    ).astype(str)
+    return ventas
+
+
+def main():
+    """Compara apply() serie contra apply_paralelo()."""
+    for n_ventas in (1_000, 200_000):
+        ventas = crear_ventas(n_ventas)
+        print(f"\n{n_ventas:,} VENTAS ({os.cpu_count()} CPU):")
+        print("-" * 30)
+
+        inicio = time.perf_counter()
+        serie = ventas.apply(evaluar_calidad_venta, axis=1)
+        tiempo_serie = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        paralelo = apply_paralelo(ventas, evaluar_calidad_venta, verbose=True)
+        tiempo_paralelo = time.perf_counter() - inicio
+
+        print(f"  apply() serie:    {tiempo_serie:.2f} s")
+        print(f"  apply_paralelo(): {tiempo_paralelo:.2f} s")
+        print(f"  Resultados iguales: {serie.equals(paralelo)}")
+
+    comisiones = apply_paralelo(ventas, calcular_comision)
+    print(f"\nComisión total: ${comisiones.sum():,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Texto como object vs string[pyarrow]
+===============================================
+
+Compara memoria y tiempo de las operaciones ``.str`` que usan los demos y
+las soluciones (``strip``, ``lower``, ``contains``, ``replace``) sobre
+columnas de comentarios y correos, con ambos tipos de almacenamiento.
+
+Uso:
+    python demos/benchmark_cadenas.py                     # 150 y 10M filas
+    python demos/benchmark_cadenas.py --filas 150 1000000
+
+Con 10M filas la versión object necesita varios GB de RAM.
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cadenas_arrow import tipo_cadena_arrow
+
+# ============================================================================
+# DATOS
+# ============================================================================
+
+COMENTARIOS = [
+    '  Excelente servicio, muy satisfecho ',
+    'Buena experiencia en general',
+    'El tiempo de respuesta podría mejorar',
+    'MUY PROFESIONALES Y EFECTIVOS',
+    'Regular, esperaba más',
+    ' Superó mis expectativas',
+    'Buen trabajo pero caro',
+    '',
+]
+NOMBRES = ['ana.garcia', 'CARLOS.LOPEZ', 'maria.rodriguez', 'juan.perez', 'laura.martin']
+
+
+def generar_textos(n_filas, semilla=42):
+    """Listas de comentarios y correos (únicos) con el estilo de los datos de encuestas."""
+    rng = np.random.default_rng(semilla)
+    comentarios = np.array(COMENTARIOS, dtype=object)[rng.integers(len(COMENTARIOS), size=n_filas)]
+    nombres = np.array(NOMBRES, dtype=object)[rng.integers(len(NOMBRES), size=n_filas)]
+    emails = [f'{nombre}{i}@company.COM' for i, nombre in enumerate(nombres)]
+    return list(comentarios), emails
+
+# ============================================================================
+# MEDICIONES
+# ============================================================================
+
+OPERACIONES = {
+    'strip': lambda s: s.str.strip(),
+    'lower': lambda s: s.str.lower(),
+    'contains': lambda s: s.str.contains('servicio|trabajo', case=False, na=False),
+    'replace': lambda s: s.str.replace('company', 'empresa', regex=False),
+}
+
+
+def _cronometrar(funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def medir(n_filas):
+    """Tabla con memoria (MB) y tiempo (s) por tipo de almacenamiento."""
+    comentarios, emails = generar_textos(n_filas)
+    repeticiones = 5 if n_filas < 100_000 else 1
+    tipos = {'object': object, 'string[pyarrow]': tipo_cadena_arrow()}
+
+    filas = []
+    for nombre_tipo, tipo in tipos.items():
+        inicio = time.perf_counter()
+        df = pd.DataFrame({
+            'comentarios': pd.Series(comentarios, dtype=tipo),
+            'email': pd.Series(emails, dtype=tipo),
+        })
+        construccion = time.perf_counter() - inicio
+        fila = {
+            'tipo': nombre_tipo,
+            'memoria_MB': df.memory_usage(deep=True, index=False).sum() / 1e6,
+            'construccion_s': construccion,
+        }
+        for operacion, funcion in OPERACIONES.items():
+            columna = df['email'] if operacion == 'replace' else df['comentarios']
+            fila[f'{operacion}_s'] = _cronometrar(lambda: funcion(columna), repeticiones)
+        filas.append(fila)
+        del df
+
+    tabla = pd.DataFrame(filas).set_index('tipo')
+    tabla.loc['mejora (x)'] = tabla.loc['object'] / tabla.loc['string[pyarrow]']
+    return tabla
+
+
+def main():
+    """Ejecuta el benchmark para cada tamaño solicitado."""
+    parser = argparse.ArgumentParser(description='Benchmark object vs string[pyarrow]')
+    parser.add_argument('--filas', nargs='+', type=int, default=[150, 10_000_000],
+                        help='Tamaños de datos a medir (por defecto 150 y 10M)')
+    args = parser.parse_args()
+
+    pd.set_option('display.width', None)
+    for n_filas in args.filas:
+        print(f"\n{n_filas:,} FILAS")
+        print("-" * 40)
+        print(medir(n_filas).round(4))
+
+
+if __name__ == "__main__":
+    main()
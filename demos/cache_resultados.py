@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Caché LRU Versionada de Resultados de Consultas
+===============================================
+
+Los mismos predicados se evalúan una y otra vez en el demo 01 y en los
+dashboards (``estado == 'En Progreso'``, umbrales de presupuesto, el
+groupby del portafolio). Esta caché guarda el resultado de cada filtro o
+agregación con una clave formada por:
+
+- La expresión normalizada con ``ast``: espacios y comillas uniformes,
+  operandos de ``&`` / ``|`` / ``and`` / ``or`` ordenados (son conmutativos)
+  y comparaciones con la columna a la izquierda (``5 < x`` → ``x > 5``)
+- La versión del dataset: un ``DatasetVersionado`` incrementa su versión
+  en cada cambio, sin recorrer los datos. Los DataFrames sueltos solo se
+  aceptan con ``CacheResultados(huella=True)``, que los identifica por su
+  huella (``hash_pandas_object``): una pasada completa por consulta, más
+  cara que la mayoría de los filtros que se quieren evitar
+
+Cuando cambia la versión de un dataset, sus entradas antiguas se descartan.
+Todos los cambios pasan por ``reemplazar`` o ``modificar``: ``datos.df``
+devuelve una copia superficial que, con Copy-on-Write (pandas 3), nunca
+modifica el frame versionado.
+El tamaño se acota en bytes (``memory_usage(deep=True)``) y se desalojan
+las entradas menos usadas recientemente. Los resultados se comparten entre
+llamadas: trátelos como de solo lectura.
+
+Las cláusulas deben ir entre paréntesis, como en el demo 01:
+``(estado == 'En Progreso') & (presupuesto > 150000)``. En ``query`` el
+``&`` liga menos que ``==`` y en Python más, así que ``a == b & c == d``
+se rechaza en vez de normalizarse con otro significado. La forma normal
+solo es la clave: la consulta se ejecuta con la expresión original. Las
+variables locales (``@umbral``) y los nombres entre backticks no se admiten.
+
+Ejemplo:
+    datos = DatasetVersionado(df)
+    cache = CacheResultados(max_bytes=256 * 1024**2)
+    activos = cache.filtrar(datos, "(presupuesto > 150000) & (estado == 'En Progreso')")
+    cache.agrupar(datos, 'cliente', {'presupuesto': 'sum'}, filtro="estado == 'En Progreso'")
+    print(cache.estadisticas())
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import ast
+import functools
+import hashlib
+import io
+import itertools
+import pickle
+import threading
+import tokenize
+from collections import OrderedDict
+
+import pandas as pd
+
+# ============================================================================
+# NORMALIZACIÓN DE EXPRESIONES
+# ============================================================================
+
+_INVERTIR = {ast.Lt: ast.Gt, ast.Gt: ast.Lt, ast.LtE: ast.GtE, ast.GtE: ast.LtE,
+             ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+_LOGICO = {ast.BitAnd: ast.And, ast.BitOr: ast.Or}
+
+
+class _Canonicalizador(ast.NodeTransformer):
+    """Reescribe una expresión en una forma canónica equivalente."""
+
+    def _operandos(self, nodo, tipo):
+        """Aplana cadenas del mismo operador conmutativo: ``a & (b & c)`` → [a, b, c]."""
+        if isinstance(nodo, ast.BinOp) and isinstance(nodo.op, tipo):
+            return self._operandos(nodo.left, tipo) + self._operandos(nodo.right, tipo)
+        if isinstance(nodo, ast.BoolOp) and isinstance(nodo.op, _LOGICO[tipo]):
+            return [o for valor in nodo.values for o in self._operandos(valor, tipo)]
+        return [self.visit(nodo)]
+
+    def _conmutativo(self, nodo, tipo):
+        operandos = sorted(self._operandos(nodo, tipo), key=ast.dump)
+        # Los duplicados (a & a) no cambian el resultado
+        operandos = [o for i, o in enumerate(operandos)
+                     if i == 0 or ast.dump(o) != ast.dump(operandos[i - 1])]
+        resultado = operandos[0]
+        for operando in operandos[1:]:
+            resultado = ast.BinOp(left=resultado, op=tipo(), right=operando)
+        return resultado
+
+    def visit_BinOp(self, nodo):
+        if isinstance(nodo.op, (ast.BitAnd, ast.BitOr)):
+            return self._conmutativo(nodo, type(nodo.op))
+        return self.generic_visit(nodo)
+
+    def visit_BoolOp(self, nodo):
+        return self._conmutativo(nodo, ast.BitAnd if isinstance(nodo.op, ast.And) else ast.BitOr)
+
+    def visit_Compare(self, nodo):
+        nodo = self.generic_visit(nodo)
+        if (len(nodo.ops) == 1 and isinstance(nodo.left, ast.Constant)
+                and not isinstance(nodo.comparators[0], ast.Constant)
+                and type(nodo.ops[0]) in _INVERTIR):
+            return ast.Compare(left=nodo.comparators[0],
+                               ops=[_INVERTIR[type(nodo.ops[0])]()],
+                               comparators=[nodo.left])
+        return nodo
+
+
+def _simbolos(expresion):
+    """Tokens de la expresión fuera de los literales de cadena."""
+    try:
+        return {t.string for t in tokenize.generate_tokens(io.StringIO(expresion).readline)
+                if t.type != tokenize.STRING}
+    except (tokenize.TokenError, SyntaxError):
+        return set()  # ast.parse dará el error
+
+
+def _sin_precedencia_ambigua(arbol, expresion):
+    """Rechaza ``&``/``|`` como operando de una comparación (``a == b & c``)."""
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Compare):
+            for operando in [nodo.left, *nodo.comparators]:
+                if isinstance(operando, ast.BinOp) and isinstance(operando.op, (ast.BitAnd, ast.BitOr)):
+                    raise ValueError(f"Ponga cada cláusula entre paréntesis: {expresion!r}")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalizar_expresion(expresion):
+    """
+    Forma canónica de una expresión de ``DataFrame.query``, para usarla como clave.
+
+    Rechaza ``@variable`` (su valor no formaría parte de la clave y ``query``
+    la buscaría en otro ámbito) y los nombres entre backticks: inserte el
+    valor en el texto, p. ej. ``f"presupuesto > {umbral!r}"``.
+    """
+    simbolos = _simbolos(expresion)
+    if '`' in simbolos:
+        raise ValueError(f"Nombres entre backticks no soportados: {expresion!r}")
+    if '@' in simbolos:
+        raise ValueError(f"Variables locales (@) no soportadas: {expresion!r}")
+    try:
+        arbol = ast.parse(expresion.strip(), mode='eval')
+    except SyntaxError as error:
+        raise ValueError(f"Expresión inválida: {expresion!r}") from error
+    _sin_precedencia_ambigua(arbol, expresion)
+    return ast.unparse(ast.fix_missing_locations(_Canonicalizador().visit(arbol)))
+
+# ============================================================================
+# VERSIÓN DEL DATASET
+# ============================================================================
+
+_identificadores = itertools.count()
+
+
+class DatasetVersionado:
+    """DataFrame con un número de versión que sube en cada cambio."""
+
+    def __init__(self, df):
+        self.id = next(_identificadores)
+        self.version = 0
+        self._df = df
+
+    @property
+    def df(self):
+        """Copia superficial para leer; los cambios van por ``modificar``."""
+        return self._df.copy(deep=False)
+
+    def reemplazar(self, df):
+        """Sustituye el frame completo (p. ej. tras recargar el archivo)."""
+        self._df = df
+        self.version += 1
+
+    def modificar(self, funcion):
+        """Aplica ``funcion(df)`` (que modifica el frame en sitio) y sube la versión."""
+        resultado = funcion(self._df)
+        self.version += 1
+        return resultado
+
+
+def huella_dataframe(df):
+    """Huella del contenido de ``df``: detecta cambios en sitio, a costa de una pasada."""
+    hash_filas = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    firma = hashlib.sha1(hash_filas.tobytes())
+    firma.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    return firma.hexdigest()[:16]
+
+
+def _origen_y_version(datos, huella):
+    if isinstance(datos, DatasetVersionado):
+        return datos.id, datos.version
+    if not huella:
+        raise TypeError("Use DatasetVersionado(df), o CacheResultados(huella=True) "
+                        "para calcular la huella del DataFrame en cada consulta")
+    return id(datos), huella_dataframe(datos)
+
+
+def _frame(datos):
+    return datos._df if isinstance(datos, DatasetVersionado) else datos
+
+# ============================================================================
+# CACHÉ
+# ============================================================================
+
+def tamano_bytes(valor):
+    """Tamaño aproximado de un resultado en memoria."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, (bytes, str)):
+        return len(valor)
+    return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class CacheResultados:
+    """
+    LRU acotada en bytes, con la versión del dataset como parte de la clave.
+
+    ``huella=True`` admite DataFrames sueltos, a costa de recorrerlos enteros
+    en cada consulta (``huella_dataframe``).
+    """
+
+    def __init__(self, max_bytes=256 * 1024**2, huella=False):
+        self.max_bytes = max_bytes
+        self.huella = huella
+        self.bytes = 0
+        self._entradas = OrderedDict()      # clave -> (valor, tamaño)
+        self._versiones = {}                # origen -> versión vigente
+        self._bloqueo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _quitar(self, clave):
+        _, tamano = self._entradas.pop(clave)
+        self.bytes -= tamano
+
+    def _invalidar_origen(self, origen, version):
+        """Descarta las entradas de versiones anteriores de ``origen``."""
+        if self._versiones.get(origen, version) != version:
+            obsoletas = [c for c in self._entradas if c[0] == origen]
+            for clave in obsoletas:
+                self._quitar(clave)
+            self.invalidaciones += len(obsoletas)
+        self._versiones[origen] = version
+
+    def obtener(self, origen, version, clave, calcular):
+        """Devuelve el resultado de ``clave`` para esa versión o lo calcula con ``calcular()``."""
+        clave = (origen, version, clave)
+        with self._bloqueo:
+            self._invalidar_origen(origen, version)
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave][0]
+            self.fallos += 1
+
+        valor = calcular()
+        tamano = tamano_bytes(valor)
+        if tamano > self.max_bytes:
+            return valor
+
+        with self._bloqueo:
+            if self._versiones.get(origen) != version:
+                return valor  # el dataset cambió mientras se calculaba
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = (valor, tamano)
+            self.bytes += tamano
+            while self.bytes > self.max_bytes:
+                self._quitar(next(iter(self._entradas)))
+                self.desalojos += 1
+        return valor
+
+    # ------------------------------------------------------------------
+    # Consultas sobre DataFrames
+    # ------------------------------------------------------------------
+
+    def filtrar(self, datos, expresion):
+        """``df.query(expresion)`` con caché; ``datos`` es un DatasetVersionado o un DataFrame."""
+        origen, version = _origen_y_version(datos, self.huella)
+        normal = normalizar_expresion(expresion)
+        return self.obtener(origen, version, ('filtro', normal),
+                            lambda: _frame(datos).query(expresion))
+
+    def agrupar(self, datos, por, agregaciones, filtro=None):
+        """``groupby(por).agg(agregaciones)`` sobre las filas de ``filtro`` (opcional)."""
+        origen, version = _origen_y_version(datos, self.huella)
+        por = (por,) if isinstance(por, str) else tuple(por)
+        normal = normalizar_expresion(filtro) if filtro else None
+        clave = ('agrupar', normal, por, repr(sorted(agregaciones.items())))
+
+        def calcular():
+            df = _frame(datos)
+            if filtro:
+                df = df.query(filtro)
+            return df.groupby(list(por)).agg(agregaciones)
+
+        return self.obtener(origen, version, clave, calcular)
+
+    def limpiar(self):
+        with self._bloqueo:
+            self._entradas.clear()
+            self._versiones.clear()
+            self.bytes = 0
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._entradas),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / consultas, 4) if consultas else 0.0,
+            'desalojos': self.desalojos,
+            'invalidaciones': self.invalidaciones,
+        }
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def main():
+    """Consultas repetidas del demo 01 con y sin caché."""
+    import time
+    from demo_01_filtrado_avanzado import cargar_datos_demo
+
+    print("\n1. NORMALIZACIÓN:")
+    print("-" * 40)
+    for expresion in ("(presupuesto > 150000) & (estado == 'En Progreso')",
+                      '(estado=="En Progreso")&(150000 < presupuesto)',
+                      "estado == 'En Progreso' and presupuesto > 150000"):
+        print(f"{expresion:52} → {normalizar_expresion(expresion)}")
+
+    datos = DatasetVersionado(cargar_datos_demo(n_proyectos=500_000))
+    cache = CacheResultados(max_bytes=64 * 1024**2)
+    consultas = [
+        "(estado == 'En Progreso') & (presupuesto > 150000)",
+        "(presupuesto > 150000) & (estado == 'En Progreso')",
+        "satisfaccion < 6.0",
+        "(gastado / presupuesto > 1.1) | (satisfaccion < 6.0)",
+    ]
+
+    print("\n2. CONSULTAS REPETIDAS (10 rondas):")
+    print("-" * 40)
+    inicio = time.perf_counter()
+    for _ in range(10):
+        for expresion in consultas:
+            datos.df.query(expresion)
+        datos.df[datos.df['estado'].isin(['En Progreso', 'Planificación'])] \
+            .groupby('cliente').agg({'presupuesto': 'sum', 'satisfaccion': 'mean'})
+    print(f"Sin caché: {time.perf_counter() - inicio:.3f} s")
+
+    inicio = time.perf_counter()
+    for _ in range(10):
+        for expresion in consultas:
+            cache.filtrar(datos, expresion)
+        cache.agrupar(datos, 'cliente', {'presupuesto': 'sum', 'satisfaccion': 'mean'},
+                      filtro="estado in ['En Progreso', 'Planificación']")
+    print(f"Con caché: {time.perf_counter() - inicio:.3f} s")
+    print(cache.estadisticas())
+
+    print("\n3. INVALIDACIÓN AL MODIFICAR EL DATASET:")
+    print("-" * 40)
+    antes = len(cache.filtrar(datos, "satisfaccion < 6.0"))
+
+    def bajar_satisfaccion(df):
+        df.loc[df.index[:1000], 'satisfaccion'] = 1.0
+
+    datos.modificar(bajar_satisfaccion)
+    despues = len(cache.filtrar(datos, "satisfaccion < 6.0"))
+    print(f"Filas con satisfacción < 6: {antes} → {despues}")
+    print(cache.estadisticas())
+
+
+if __name__ == "__main__":
+    main()
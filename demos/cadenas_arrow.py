@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Almacenamiento de Texto con Arrow
+=================================
+
+Las columnas de texto libre y de contacto (``comentarios``, ``notas``,
+``nombre``, ``email``, ``telefono``, ``concepto``) se guardan por defecto
+como arreglos de objetos ``str`` de Python: ~50 bytes de sobrecosto por
+valor y un bucle de Python en cada operación ``.str``.
+
+Con ``MERIDIAN_CADENAS_ARROW=1`` los cargadores (``leer_csv``) guardan esas
+columnas como ``string[pyarrow]``: un buffer contiguo de bytes más offsets,
+con operaciones ``.str`` implementadas en C++. Las llamadas existentes
+(``.str.strip()``, ``.str.lower()``, ``.str.contains()``, ``.str.replace()``)
+funcionan igual; los nulos se representan como ``pd.NA``.
+
+Requiere ``pyarrow`` (``pip install pyarrow``) solo cuando se activa.
+
+Uso:
+    from cadenas_arrow import leer_csv, convertir_cadenas
+    empleados = leer_csv('datos/empleados_sucio.csv')
+    encuestas = convertir_cadenas(encuestas)
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import os
+
+import pandas as pd
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+VARIABLE_ACTIVACION = 'MERIDIAN_CADENAS_ARROW'
+COLUMNAS_TEXTO = ('comentarios', 'notas', 'nombre', 'email', 'telefono', 'concepto')
+
+
+def arrow_activo():
+    """Indica si el almacenamiento Arrow está activado por variable de entorno."""
+    return os.environ.get(VARIABLE_ACTIVACION, '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+def tipo_cadena_arrow():
+    """``StringDtype`` respaldado por Arrow, con un error claro si falta pyarrow."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as error:
+        raise ImportError(
+            f"{VARIABLE_ACTIVACION}=1 requiere pyarrow: pip install pyarrow"
+        ) from error
+    return pd.StringDtype('pyarrow')
+
+# ============================================================================
+# CONVERSIÓN Y CARGADORES
+# ============================================================================
+
+def convertir_cadenas(df, columnas=None, forzar=False):
+    """
+    Convierte las columnas de texto a ``string[pyarrow]`` si está activado.
+
+    ``columnas`` por defecto son las de ``COLUMNAS_TEXTO`` presentes en ``df``.
+    Con ``forzar=True`` convierte aunque la variable de entorno no esté activa.
+    Devuelve el mismo DataFrame (modificado) para encadenar llamadas.
+    """
+    if not (forzar or arrow_activo()):
+        return df
+    tipo = tipo_cadena_arrow()
+    columnas = [c for c in (columnas or COLUMNAS_TEXTO) if c in df.columns]
+    for columna in columnas:
+        df[columna] = df[columna].astype(tipo)
+    return df
+
+
+def leer_csv(ruta, columnas_texto=None, **kwargs):
+    """``pd.read_csv`` con almacenamiento Arrow opcional para las columnas de texto."""
+    return convertir_cadenas(pd.read_csv(ruta, **kwargs), columnas_texto)
+
+
+def leer_excel(ruta, columnas_texto=None, **kwargs):
+    """``pd.read_excel`` con almacenamiento Arrow opcional (una hoja o varias)."""
+    resultado = pd.read_excel(ruta, **kwargs)
+    if isinstance(resultado, dict):
+        return {hoja: convertir_cadenas(df, columnas_texto) for hoja, df in resultado.items()}
+    return convertir_cadenas(resultado, columnas_texto)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Características de Fecha con Tablas de Búsqueda
+===============================================
+
+En las soluciones cada característica de calendario es una pasada distinta
+y algunas formatean un string por fila, por ejemplo
+``dt.strftime('%B')`` o ``'Q' + dt.quarter.astype(str)``. Este módulo
+calcula un conjunto de características en una sola pasada sobre la
+representación entera de ``datetime64``:
+
+- Días y meses desde la época se obtienen con ``astype`` de NumPy
+- Las etiquetas (mes, trimestre, semestre) son ``Categorical`` construidos
+  con ``from_codes`` sobre tablas precalculadas: cero strings por fila
+- Las fechas nulas (NaT) producen nulos en todas las características
+
+Características disponibles: ver ``CARACTERISTICAS``.
+
+Ejemplo:
+    calendario = caracteristicas_fecha(
+        ventas['fecha_venta'],
+        ['mes_texto', 'trimestre_texto', 'es_primer_semestre', 'semanas_desde'],
+    )
+    ventas = ventas.join(calendario)
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# TABLAS DE BÚSQUEDA
+# ============================================================================
+
+NOMBRES_MES = {
+    'es': ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+           'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'],
+    'en': ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December'],
+}
+NOMBRES_DIA = {
+    'es': ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo'],
+    'en': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+}
+TRIMESTRES = ['Q1', 'Q2', 'Q3', 'Q4']
+SEMESTRES = ['S1', 'S2']
+
+CARACTERISTICAS = (
+    'anio', 'mes', 'mes_texto', 'trimestre', 'trimestre_texto',
+    'semestre', 'semestre_texto', 'es_primer_semestre',
+    'semana_iso', 'anio_iso', 'dia_semana', 'dia_semana_texto',
+    'dias_desde', 'semanas_desde', 'dias_habiles_desde',
+)
+
+# ============================================================================
+# CÁLCULO
+# ============================================================================
+
+def _entero(valores, nulos):
+    """Entero NumPy si no hay nulos; ``Int64`` nullable en caso contrario."""
+    if nulos.any():
+        return pd.arrays.IntegerArray(valores.astype(np.int64), nulos)
+    return valores.astype(np.int64)
+
+
+def _booleano(valores, nulos):
+    """Booleano NumPy si no hay nulos; ``boolean`` nullable en caso contrario."""
+    if nulos.any():
+        return pd.arrays.BooleanArray(valores, nulos)
+    return valores
+
+
+def _categoria(codigos, etiquetas, nulos):
+    codigos = np.where(nulos, -1, codigos)
+    return pd.Categorical.from_codes(codigos, categories=etiquetas, ordered=True)
+
+
+def caracteristicas_fecha(fechas, caracteristicas=CARACTERISTICAS, ancla=None,
+                          idioma='es', festivos=None, prefijo=''):
+    """
+    DataFrame con las características pedidas, alineado con el índice de ``fechas``.
+
+    ``ancla`` es la fecha de referencia de ``dias_desde``, ``semanas_desde`` y
+    ``dias_habiles_desde`` (por defecto, la fecha mínima). ``festivos`` es una
+    lista de fechas excluidas del conteo de días hábiles (lunes a viernes).
+    Las fechas con zona horaria se toman en su hora local. Sin ``ancla``, un
+    chunk sin ninguna fecha válida devuelve esas columnas nulas.
+    """
+    desconocidas = set(caracteristicas) - set(CARACTERISTICAS)
+    if desconocidas:
+        raise ValueError(f"Características desconocidas: {sorted(desconocidas)}")
+    pedidas = set(caracteristicas)
+
+    fechas = pd.Series(fechas)
+    convertidas = pd.to_datetime(fechas)
+    if convertidas.dt.tz is not None:
+        # Hora local de la zona, no UTC: 00:30 en Madrid sigue siendo ese día
+        convertidas = convertidas.dt.tz_localize(None)
+    valores = convertidas.to_numpy(dtype='datetime64[ns]')
+    nulos = np.isnat(valores)
+    dias_d = valores.astype('datetime64[D]')
+    dias = dias_d.view(np.int64)
+
+    # Intermedios compartidos por casi todas las características, calculados una vez
+    meses = valores.astype('datetime64[M]').view(np.int64)
+    anio = meses // 12 + 1970
+    mes0 = meses % 12
+    dia_semana = (dias + 3) % 7  # 1970-01-01 fue jueves; lunes = 0
+
+    columnas = {}
+    if 'anio' in pedidas:
+        columnas['anio'] = _entero(anio, nulos)
+    if 'mes' in pedidas:
+        columnas['mes'] = _entero(mes0 + 1, nulos)
+    if 'mes_texto' in pedidas:
+        columnas['mes_texto'] = _categoria(mes0, NOMBRES_MES[idioma], nulos)
+    if 'trimestre' in pedidas:
+        columnas['trimestre'] = _entero(mes0 // 3 + 1, nulos)
+    if 'trimestre_texto' in pedidas:
+        columnas['trimestre_texto'] = _categoria(mes0 // 3, TRIMESTRES, nulos)
+    if 'semestre' in pedidas:
+        columnas['semestre'] = _entero(mes0 // 6 + 1, nulos)
+    if 'semestre_texto' in pedidas:
+        columnas['semestre_texto'] = _categoria(mes0 // 6, SEMESTRES, nulos)
+    if 'es_primer_semestre' in pedidas:
+        columnas['es_primer_semestre'] = _booleano(mes0 < 6, nulos)
+    if pedidas & {'semana_iso', 'anio_iso'}:
+        # La semana ISO es la del jueves de esa semana
+        jueves = (dias - dia_semana + 3).astype('datetime64[D]')
+        anio_iso = jueves.astype('datetime64[Y]')
+        if 'semana_iso' in pedidas:
+            inicio_anio = anio_iso.astype('datetime64[D]').view(np.int64)
+            columnas['semana_iso'] = _entero((jueves.view(np.int64) - inicio_anio) // 7 + 1, nulos)
+        if 'anio_iso' in pedidas:
+            columnas['anio_iso'] = _entero(anio_iso.view(np.int64) + 1970, nulos)
+    if 'dia_semana' in pedidas:
+        columnas['dia_semana'] = _entero(dia_semana, nulos)
+    if 'dia_semana_texto' in pedidas:
+        columnas['dia_semana_texto'] = _categoria(dia_semana, NOMBRES_DIA[idioma], nulos)
+    if pedidas & {'dias_desde', 'semanas_desde', 'dias_habiles_desde'}:
+        if ancla is not None:
+            ancla_d = np.datetime64(pd.Timestamp(ancla), 'D')
+        elif not nulos.all():
+            ancla_d = dias_d[~nulos].min()
+        else:
+            ancla_d = np.datetime64(0, 'D')  # Chunk sin fechas: todo queda nulo
+        desde = dias - ancla_d.astype(np.int64)
+        if 'dias_desde' in pedidas:
+            columnas['dias_desde'] = _entero(desde, nulos)
+        if 'semanas_desde' in pedidas:
+            columnas['semanas_desde'] = _entero(desde // 7, nulos)
+        if 'dias_habiles_desde' in pedidas:
+            feriados = (np.array(pd.to_datetime(festivos), dtype='datetime64[D]')
+                        if festivos is not None else [])
+            habiles = np.zeros(len(dias), dtype=np.int64)
+            habiles[~nulos] = np.busday_count(ancla_d, dias_d[~nulos], holidays=feriados)
+            columnas['dias_habiles_desde'] = _entero(habiles, nulos)
+
+    resultado = pd.DataFrame({c: columnas[c] for c in caracteristicas}, index=fechas.index)
+    return resultado.add_prefix(prefijo) if prefijo else resultado
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def main():
+    """Compara el enfoque de ejercicio3.py con el cálculo en una pasada."""
+    import time
+
+    n_ventas = 2_000_000
+    rng = np.random.default_rng(42)
+    fechas = pd.Series(pd.Timestamp('2024-01-01')
+                       + pd.to_timedelta(rng.integers(0, 730, n_ventas), unit='D'))
+
+    print(f"\n{n_ventas:,} FECHAS DE VENTA:")
+    print("-" * 30)
+    inicio = time.perf_counter()
+    referencia = pd.DataFrame({
+        'mes_texto': fechas.dt.strftime('%B'),
+        'trimestre_texto': 'Q' + fechas.dt.quarter.astype(str),
+        'es_primer_semestre': fechas.dt.month <= 6,
+        'semanas_desde': (fechas - fechas.min()).dt.days // 7,
+    })
+    tiempo_dt = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    calendario = caracteristicas_fecha(
+        fechas, ['mes_texto', 'trimestre_texto', 'es_primer_semestre', 'semanas_desde'],
+        idioma='en',
+    )
+    tiempo_tablas = time.perf_counter() - inicio
+
+    print(f"Accesores dt/strftime: {tiempo_dt:.3f} s")
+    print(f"Tablas de búsqueda:    {tiempo_tablas:.3f} s")
+    iguales = all(
+        (calendario[c].astype(str) == referencia[c].astype(str)).all() for c in referencia
+    )
+    print(f"Resultados iguales:    {iguales}")
+
+    iso = fechas.dt.isocalendar()
+    completas = caracteristicas_fecha(fechas, ['semana_iso', 'anio_iso', 'dias_habiles_desde'])
+    print(f"Semana ISO correcta:   {(completas['semana_iso'] == iso['week']).all()}")
+    print(f"Año ISO correcto:      {(completas['anio_iso'] == iso['year']).all()}")
+
+    print("\nEjemplo (todas las características):")
+    print(caracteristicas_fecha(fechas.head(3)).T)
+
+
+if __name__ == "__main__":
+    main()
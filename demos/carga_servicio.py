@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Generador de Carga para el Servicio de Consultas
+================================================
+
+Lanza N clientes concurrentes contra ``servicio_consultas.py``. Cada
+cliente mantiene una conexión keep-alive y envía peticiones en bucle,
+rotando entre una mezcla de consultas (filtros, agrupaciones, riesgo y
+portafolio). Al final reporta el throughput y las latencias p50/p99.
+
+Uso:
+    python demos/servicio_consultas.py &
+    python demos/carga_servicio.py --clientes 32 --duracion 10
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+MEZCLA_CONSULTAS = [
+    {'tipo': 'riesgo', 'limite': 10},
+    {'tipo': 'portafolio'},
+    {'tipo': 'filtro',
+     'condiciones': [['presupuesto', 'between', [100_000, 200_000]],
+                     ['estado', '==', 'En Progreso']],
+     'columnas': ['proyecto_id', 'cliente', 'presupuesto'], 'limite': 10},
+    {'tipo': 'agrupar', 'por': ['cliente', 'estado'],
+     'agregaciones': {'presupuesto': 'sum', 'satisfaccion': 'mean'}},
+    {'tipo': 'filtro', 'condiciones': [['satisfaccion', '<', 6.0]], 'limite': 5},
+]
+
+# ============================================================================
+# CLIENTE
+# ============================================================================
+
+async def _peticion(lector, escritor, host, cuerpo):
+    """Envía un POST /consulta y devuelve el código de estado."""
+    escritor.write(
+        f"POST /consulta HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n"
+        .encode('ascii') + cuerpo
+    )
+    await escritor.drain()
+    cabecera = await lector.readuntil(b'\r\n\r\n')
+    lineas = cabecera.decode('latin-1').split('\r\n')
+    largo = 0
+    for linea in lineas[1:]:
+        if linea.lower().startswith('content-length:'):
+            largo = int(linea.split(':', 1)[1])
+    await lector.readexactly(largo)
+    return int(lineas[0].split(' ')[1])
+
+
+async def cliente(numero, host, puerto, fin, latencias, estados):
+    """Envía peticiones por una conexión hasta ``fin`` (reloj monotónico)."""
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    cuerpos = [json.dumps(c).encode('utf-8') for c in MEZCLA_CONSULTAS]
+    i = numero
+    try:
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            estado = await _peticion(lector, escritor, host, cuerpos[i % len(cuerpos)])
+            latencias.append(time.perf_counter() - inicio)
+            estados[estado] = estados.get(estado, 0) + 1
+            i += 1
+    finally:
+        escritor.close()
+
+
+async def generar_carga(host, puerto, clientes, duracion):
+    """Ejecuta la carga y devuelve (latencias en s, conteo por estado, duración real)."""
+    latencias, estados = [], {}
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    await asyncio.gather(*(cliente(n, host, puerto, fin, latencias, estados)
+                           for n in range(clientes)))
+    return np.array(latencias), estados, time.perf_counter() - inicio
+
+# ============================================================================
+# REPORTE
+# ============================================================================
+
+def main():
+    """Reporta throughput y latencias para cada nivel de concurrencia."""
+    parser = argparse.ArgumentParser(description='Generador de carga del servicio de consultas')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--clientes', nargs='+', type=int, default=[1, 8, 32],
+                        help='Niveles de concurrencia a medir')
+    parser.add_argument('--duracion', type=float, default=5.0, help='Segundos por nivel')
+    args = parser.parse_args()
+
+    print(f"\nCARGA CONTRA http://{args.host}:{args.puerto}")
+    print("-" * 72)
+    print(f"{'clientes':>8} {'peticiones':>11} {'req/s':>9} {'p50 ms':>9} "
+          f"{'p99 ms':>9} {'máx ms':>9}  estados")
+    for clientes in args.clientes:
+        latencias, estados, duracion = asyncio.run(
+            generar_carga(args.host, args.puerto, clientes, args.duracion)
+        )
+        p50, p99 = np.percentile(latencias, [50, 99]) * 1000
+        print(f"{clientes:>8} {len(latencias):>11,} {len(latencias) / duracion:>9.1f} "
+              f"{p50:>9.2f} {p99:>9.2f} {latencias.max() * 1000:>9.2f}  {estados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Cubo de Agregados Incremental para Análisis de Portafolio
+=========================================================
+
+Materializa medidas aditivas sobre las dimensiones
+``cliente × tipo_proyecto × region × estado``:
+
+- Número de proyectos por celda
+- Por cada medida: conteo de valores no nulos, suma y suma de cuadrados
+
+Como todas las medidas son aditivas, el cubo se mantiene de forma
+incremental ante inserciones, actualizaciones y cambios de estado, y
+cualquier roll-up o drill-down (conteo, suma, promedio, desviación) se
+responde combinando celdas, sin volver a recorrer las filas.
+
+Ejemplo:
+    cubo = CuboAgregados.desde_dataframe(proyectos)
+    cubo.cambiar_estado('P007', 'Completado')
+    cubo.portafolio_activo()                      # por cliente
+    cubo.consultar(por=['cliente', 'region'], filtros={'estado': 'En Progreso'})
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+DIMENSIONES = ('cliente', 'tipo_proyecto', 'region', 'estado')
+MEDIDAS = ('presupuesto', 'gastado', 'satisfaccion')
+ESTADOS_ACTIVOS = ('En Progreso', 'Planificación')
+
+# ============================================================================
+# CUBO
+# ============================================================================
+
+class CuboAgregados:
+    """
+    Cubo de medidas aditivas mantenido incrementalmente.
+
+    Cada celda guarda un vector ``[filas, n_1..n_m, suma_1..suma_m, suma2_1..suma2_m]``.
+    Además se conserva, por clave de fila, su celda y sus valores, para poder
+    restar su contribución al actualizarla o eliminarla.
+    """
+
+    def __init__(self, dimensiones=DIMENSIONES, medidas=MEDIDAS, clave='proyecto_id'):
+        self.dimensiones = tuple(dimensiones)
+        self.medidas = tuple(medidas)
+        self.clave = clave
+        self._celdas = {}
+        self._filas = {}
+        self._tabla = None
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def desde_dataframe(cls, df, dimensiones=DIMENSIONES, medidas=MEDIDAS, clave='proyecto_id'):
+        """Construye el cubo con una sola agregación vectorizada."""
+        repetidas = df[clave][df[clave].duplicated()]
+        if len(repetidas):
+            raise KeyError(f"Claves repetidas en {clave!r}: {list(repetidas.unique()[:5])}")
+        cubo = cls(dimensiones, medidas, clave)
+        dims, meds = list(cubo.dimensiones), list(cubo.medidas)
+
+        valores = df[meds].astype(float)
+        base = df[dims].copy()
+        for medida in meds:
+            no_nulo = valores[medida].notna()
+            base[f'n_{medida}'] = no_nulo.astype(float)
+            base[f'suma_{medida}'] = valores[medida].where(no_nulo, 0.0)
+            base[f'suma2_{medida}'] = base[f'suma_{medida}'] ** 2
+        base['filas'] = 1.0
+
+        columnas = (['filas'] + [f'n_{m}' for m in meds] + [f'suma_{m}' for m in meds]
+                    + [f'suma2_{m}' for m in meds])
+        agregado = base.groupby(dims, sort=False, dropna=False)[columnas].sum()
+        for celda, vector in zip(agregado.index, agregado.to_numpy()):
+            cubo._celdas[celda if isinstance(celda, tuple) else (celda,)] = vector.copy()
+
+        celdas = list(df[dims].itertuples(index=False, name=None))
+        for id_fila, celda, vals in zip(df[clave], celdas, valores.to_numpy()):
+            cubo._filas[id_fila] = (celda, vals)
+        return cubo
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+
+    def _contribucion(self, valores):
+        no_nulo = ~np.isnan(valores)
+        limpios = np.where(no_nulo, valores, 0.0)
+        return np.concatenate(([1.0], no_nulo.astype(float), limpios, limpios ** 2))
+
+    def _sumar(self, celda, valores, signo):
+        vector = self._celdas.get(celda)
+        delta = signo * self._contribucion(valores)
+        if vector is None:
+            self._celdas[celda] = delta
+        else:
+            vector += delta
+            if vector[0] <= 0:
+                del self._celdas[celda]
+        self._tabla = None
+
+    def _leer_fila(self, fila):
+        celda = tuple(fila[d] for d in self.dimensiones)
+        valores = np.array([fila.get(m, np.nan) for m in self.medidas], dtype=float)
+        return celda, valores
+
+    def insertar(self, fila):
+        """Agrega una fila (dict o Series) al cubo."""
+        id_fila = fila[self.clave]
+        if id_fila in self._filas:
+            raise KeyError(f"La fila {id_fila!r} ya existe en el cubo")
+        celda, valores = self._leer_fila(fila)
+        self._filas[id_fila] = (celda, valores)
+        self._sumar(celda, valores, +1)
+
+    def eliminar(self, id_fila):
+        """Quita una fila del cubo."""
+        celda, valores = self._filas.pop(id_fila)
+        self._sumar(celda, valores, -1)
+
+    def actualizar(self, id_fila, **cambios):
+        """Modifica dimensiones y/o medidas de una fila existente."""
+        celda, valores = self._filas[id_fila]
+        fila = dict(zip(self.dimensiones, celda))
+        fila.update(zip(self.medidas, valores))
+        fila.update(cambios)
+        nueva_celda, nuevos_valores = self._leer_fila(fila)
+        self._sumar(celda, valores, -1)
+        self._sumar(nueva_celda, nuevos_valores, +1)
+        self._filas[id_fila] = (nueva_celda, nuevos_valores)
+
+    def cambiar_estado(self, id_fila, estado):
+        """Atajo para el cambio de estado de un proyecto."""
+        self.actualizar(id_fila, estado=estado)
+
+    def __len__(self):
+        return len(self._filas)
+
+    # ------------------------------------------------------------------
+    # Consultas (sobre celdas, nunca sobre filas)
+    # ------------------------------------------------------------------
+
+    def _tabla_celdas(self):
+        if self._tabla is None:
+            m = len(self.medidas)
+            columnas = (['filas'] + [f'n_{x}' for x in self.medidas]
+                        + [f'suma_{x}' for x in self.medidas]
+                        + [f'suma2_{x}' for x in self.medidas])
+            celdas = list(self._celdas)
+            matriz = (np.vstack(list(self._celdas.values())) if celdas
+                      else np.empty((0, 1 + 3 * m)))
+            tabla = pd.DataFrame(celdas or None, columns=list(self.dimensiones))
+            self._tabla = pd.concat([tabla, pd.DataFrame(matriz, columns=columnas)], axis=1)
+        return self._tabla
+
+    def consultar(self, por=('cliente',), filtros=None):
+        """
+        Roll-up / drill-down sobre las dimensiones ``por``.
+
+        ``filtros`` es un dict dimensión -> valor o lista de valores.
+        Devuelve, por grupo, el número de filas y para cada medida la suma,
+        el promedio y la desviación estándar muestral.
+        """
+        tabla = self._tabla_celdas()
+        if filtros:
+            mascara = np.ones(len(tabla), dtype=bool)
+            for dimension, valor in filtros.items():
+                valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+                mascara &= tabla[dimension].isin(valores).to_numpy()
+            tabla = tabla[mascara]
+
+        por = list(por)
+        medidas_crudas = tabla.drop(columns=list(self.dimensiones))
+        if por:
+            sumas = medidas_crudas.groupby([tabla[d] for d in por], sort=True).sum()
+        else:
+            sumas = medidas_crudas.sum().to_frame('total').T
+
+        resultado = pd.DataFrame(index=sumas.index)
+        resultado['num_proyectos'] = sumas['filas'].astype(int)
+        for medida in self.medidas:
+            n = sumas[f'n_{medida}']
+            suma = sumas[f'suma_{medida}']
+            media = suma / n.where(n > 0)
+            varianza = (sumas[f'suma2_{medida}'] - n * media ** 2) / (n - 1).where(n > 1)
+            resultado[f'{medida}_suma'] = suma
+            resultado[f'{medida}_promedio'] = media
+            resultado[f'{medida}_desviacion'] = np.sqrt(varianza.clip(lower=0))
+        return resultado
+
+    def portafolio_activo(self, estados=ESTADOS_ACTIVOS):
+        """Equivalente del 'análisis de portafolio por cliente' del demo 01."""
+        resultado = self.consultar(por=['cliente'], filtros={'estado': list(estados)})
+        resultado = resultado[['num_proyectos', 'presupuesto_suma', 'satisfaccion_promedio']]
+        resultado.columns = ['Num_Proyectos', 'Presupuesto_Total', 'Satisfaccion_Promedio']
+        return resultado.round(2)
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def main():
+    """Compara el cubo contra el groupby del demo 01 y muestra actualizaciones."""
+    from demo_01_filtrado_avanzado import crear_datos_demo
+
+    df = crear_datos_demo()
+    cubo = CuboAgregados.desde_dataframe(df)
+    print(f"\n✓ Cubo construido: {len(cubo)} filas en {len(cubo._celdas)} celdas")
+
+    print("\n1. PORTAFOLIO ACTIVO POR CLIENTE (desde el cubo):")
+    print("-" * 50)
+    print(cubo.portafolio_activo())
+
+    activos = df[df['estado'].isin(ESTADOS_ACTIVOS)]
+    referencia = activos.groupby('cliente').agg({
+        'proyecto_id': 'count',
+        'presupuesto': 'sum',
+        'satisfaccion': 'mean'
+    }).round(2)
+    referencia.columns = ['Num_Proyectos', 'Presupuesto_Total', 'Satisfaccion_Promedio']
+    print(f"Coincide con groupby: {np.allclose(referencia, cubo.portafolio_activo())}")
+
+    print("\n2. ACTUALIZACIONES INCREMENTALES:")
+    print("-" * 35)
+    cubo.cambiar_estado('P002', 'Completado')
+    cubo.actualizar('P003', presupuesto=250000.0)
+    cubo.insertar({'proyecto_id': 'P999', 'cliente': 'Tech Corp', 'tipo_proyecto': 'Digital',
+                   'region': 'Norte', 'estado': 'En Progreso', 'presupuesto': 90000.0,
+                   'gastado': 10000.0, 'satisfaccion': 8.0})
+    print(cubo.portafolio_activo())
+
+    print("\n3. DRILL-DOWN CLIENTE × REGIÓN (Tech Corp):")
+    print("-" * 45)
+    drill = cubo.consultar(por=['cliente', 'region'], filtros={'cliente': 'Tech Corp'})
+    print(drill[['num_proyectos', 'presupuesto_suma', 'satisfaccion_promedio']].round(2))
+
+
+if __name__ == "__main__":
+    main()
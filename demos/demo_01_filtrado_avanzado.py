@@ -16,11 +16,14 @@ Autor: Equipo Meridian Consulting
 Fecha: 2025
 """
 
+import os
 import pandas as pd
 import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
+from perfilado import etapa
+
 # ============================================================================
 # CONFIGURACIÓN INICIAL
 # ============================================================================
@@ -36,13 +39,14 @@ def configurar_pandas():
 # GENERACIÓN DE DATOS DE EJEMPLO
 # ============================================================================
 
-def crear_datos_demo():
+VERSION_DATOS_DEMO = 1  # Incrementar si cambia la lógica de generación
+
+@etapa('crear_datos_demo')
+def crear_datos_demo(semilla=42, n_proyectos=50):
     """Crea un dataset de proyectos para demostración."""
-    np.random.seed(42)
+    np.random.seed(semilla)
     
     # Generar datos realistas de proyectos de consultoría
-    n_proyectos = 50
-    
     proyectos = pd.DataFrame({
         'proyecto_id': [f'P{i:03d}' for i in range(1, n_proyectos + 1)],
         'cliente': np.random.choice(['Tech Corp', 'Finance Ltd', 'Health Systems', 'Retail Plus', 'Manufacturing Co'], n_proyectos),
@@ -67,10 +71,35 @@ def crear_datos_demo():
     print(f"  Columnas: {list(proyectos.columns)}")
     return proyectos
 
+def cargar_datos_demo(semilla=42, n_proyectos=50, directorio_cache=None):
+    """
+    Devuelve el dataset de demostración reutilizando una copia en caché.
+
+    La caché se guarda en formato pickle, con clave (versión, semilla, tamaño),
+    en ``directorio_cache`` o en ``MERIDIAN_CACHE_DIR`` (por defecto ``.cache/``).
+    """
+    directorio = directorio_cache or os.environ.get('MERIDIAN_CACHE_DIR', '.cache')
+    ruta = os.path.join(
+        directorio, f'datos_demo_v{VERSION_DATOS_DEMO}_s{semilla}_n{n_proyectos}.pkl'
+    )
+    if os.path.exists(ruta):
+        proyectos = pd.read_pickle(ruta)
+        print(f"✓ Dataset cargado desde caché: {len(proyectos)} proyectos ({ruta})")
+        return proyectos
+    
+    proyectos = crear_datos_demo(semilla, n_proyectos)
+    os.makedirs(directorio, exist_ok=True)
+    # Escritura atómica para ejecuciones concurrentes desde el planificador
+    temporal = f'{ruta}.{os.getpid()}.tmp'
+    proyectos.to_pickle(temporal)
+    os.replace(temporal, ruta)
+    return proyectos
+
 # ============================================================================
 # DEMO 1: FILTROS BÁSICOS VS AVANZADOS
 # ============================================================================
 
+@etapa('demo_filtros_basicos_vs_avanzados')
 def demo_filtros_basicos_vs_avanzados(df):
     """Compara filtros básicos con técnicas avanzadas."""
     print("\n" + "="*60)
@@ -108,6 +137,7 @@ def demo_filtros_basicos_vs_avanzados(df):
 # DEMO 2: OPERADORES LÓGICOS AVANZADOS
 # ============================================================================
 
+@etapa('demo_operadores_logicos')
 def demo_operadores_logicos(df):
     """Demuestra uso avanzado de operadores lógicos."""
     print("\n" + "="*60)
@@ -148,6 +178,7 @@ def demo_operadores_logicos(df):
 # DEMO 3: SELECCIÓN AVANZADA CON LOC E ILOC
 # ============================================================================
 
+@etapa('demo_seleccion_avanzada')
 def demo_seleccion_avanzada(df):
     """Demuestra técnicas avanzadas de selección."""
     print("\n" + "="*60)
@@ -197,6 +228,7 @@ def demo_seleccion_avanzada(df):
 # DEMO 4: FILTRADO POR RANGOS Y PATRONES
 # ============================================================================
 
+@etapa('demo_filtrado_rangos_patrones')
 def demo_filtrado_rangos_patrones(df):
     """Demuestra filtrado por rangos y patrones de texto."""
     print("\n" + "="*60)
@@ -238,6 +270,7 @@ def demo_filtrado_rangos_patrones(df):
 # DEMO 5: CASOS PRÁCTICOS DE CONSULTORÍA
 # ============================================================================
 
+@etapa('demo_casos_practicos')
 def demo_casos_practicos(df):
     """Casos prácticos específicos de consultoría."""
     print("\n" + "="*60)
@@ -312,6 +345,7 @@ def demo_casos_practicos(df):
 # DEMO 6: OPTIMIZACIÓN Y MEJORES PRÁCTICAS
 # ============================================================================
 
+@etapa('demo_optimizacion')
 def demo_optimizacion(df):
     """Demuestra técnicas de optimización para filtrado."""
     print("\n" + "="*60)
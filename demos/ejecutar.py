@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Punto de Entrada: Ejecución Selectiva de Demos
+==============================================
+
+CLI de arranque rápido para invocar los demos desde planificadores.
+Solo importa la biblioteca estándar al inicio; Pandas/NumPy y el módulo
+del demo se cargan cuando un subcomando realmente los necesita.
+
+Subcomandos:
+    listar                       Muestra las etapas disponibles (sin importar Pandas)
+    ejecutar [--only ETAPA ...]  Ejecuta una o varias etapas del demo 01
+
+Ejemplos:
+    python demos/ejecutar.py listar
+    python demos/ejecutar.py ejecutar --only casos_practicos
+    python demos/ejecutar.py ejecutar --only rangos_patrones --semilla 7 --n-proyectos 500
+    python demos/ejecutar.py ejecutar --reporte-arranque
+
+El dataset se reutiliza desde caché (clave: semilla y tamaño) salvo que se
+indique ``--sin-cache``.
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import time
+
+_T_INICIO = time.perf_counter()
+
+import argparse
+import importlib
+import sys
+
+# ============================================================================
+# CATÁLOGO DE ETAPAS
+# ============================================================================
+
+MODULO_DEMO = 'demo_01_filtrado_avanzado'
+
+# Nombre corto -> función del demo (se resuelve de forma perezosa)
+ETAPAS = {
+    'filtros_basicos': 'demo_filtros_basicos_vs_avanzados',
+    'operadores_logicos': 'demo_operadores_logicos',
+    'seleccion_avanzada': 'demo_seleccion_avanzada',
+    'rangos_patrones': 'demo_filtrado_rangos_patrones',
+    'casos_practicos': 'demo_casos_practicos',
+    'optimizacion': 'demo_optimizacion',
+}
+
+# ============================================================================
+# REPORTE DE ARRANQUE
+# ============================================================================
+
+class Cronometro:
+    """Acumula la duración de cada fase del arranque y la ejecución."""
+
+    def __init__(self):
+        self.fases = [('arranque_cli', time.perf_counter() - _T_INICIO)]
+
+    def medir(self, nombre, funcion, *args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = funcion(*args, **kwargs)
+        self.fases.append((nombre, time.perf_counter() - inicio))
+        return resultado
+
+    def imprimir(self):
+        total = time.perf_counter() - _T_INICIO
+        print("\n" + "=" * 60)
+        print("⏱  REPORTE DE ARRANQUE")
+        print("=" * 60)
+        for nombre, segundos in self.fases:
+            print(f"   {nombre:<30} {segundos * 1000:9.1f} ms")
+        print(f"   {'total (desde inicio del CLI)':<30} {total * 1000:9.1f} ms")
+
+# ============================================================================
+# SUBCOMANDOS
+# ============================================================================
+
+def comando_listar(args):
+    """Lista las etapas sin cargar módulos pesados."""
+    for nombre, funcion in ETAPAS.items():
+        print(f"{nombre:<20} -> {MODULO_DEMO}.{funcion}")
+    return 0
+
+
+def comando_ejecutar(args):
+    """Ejecuta las etapas seleccionadas sobre el dataset (posiblemente en caché)."""
+    cronometro = Cronometro()
+    etapas = args.only or list(ETAPAS)
+
+    demo = cronometro.medir('import_modulos_pesados', importlib.import_module, MODULO_DEMO)
+    demo.configurar_pandas()
+
+    if args.sin_cache:
+        df = cronometro.medir('datos_demo', demo.crear_datos_demo, args.semilla, args.n_proyectos)
+    else:
+        df = cronometro.medir(
+            'datos_demo', demo.cargar_datos_demo, args.semilla, args.n_proyectos, args.cache_dir
+        )
+
+    for nombre in etapas:
+        cronometro.medir(f'etapa:{nombre}', getattr(demo, ETAPAS[nombre]), df)
+
+    if args.reporte_arranque:
+        cronometro.imprimir()
+    return 0
+
+
+def construir_parser():
+    """Define la interfaz de línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description='Ejecución selectiva de los demos de filtrado avanzado.'
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    listar = subparsers.add_parser('listar', help='Lista las etapas disponibles')
+    listar.set_defaults(funcion=comando_listar)
+
+    ejecutar = subparsers.add_parser('ejecutar', help='Ejecuta etapas del demo')
+    ejecutar.add_argument('--only', nargs='+', choices=list(ETAPAS), metavar='ETAPA',
+                          help=f"Etapas a ejecutar (por defecto todas): {', '.join(ETAPAS)}")
+    ejecutar.add_argument('--semilla', type=int, default=42, help='Semilla del dataset')
+    ejecutar.add_argument('--n-proyectos', type=int, default=50, help='Filas del dataset')
+    ejecutar.add_argument('--cache-dir', default=None,
+                          help='Directorio de caché (por defecto MERIDIAN_CACHE_DIR o .cache/)')
+    ejecutar.add_argument('--sin-cache', action='store_true',
+                          help='Regenera el dataset sin leer ni escribir la caché')
+    ejecutar.add_argument('--reporte-arranque', action='store_true',
+                          help='Muestra el tiempo de cada fase al terminar')
+    ejecutar.set_defaults(funcion=comando_ejecutar)
+
+    return parser
+
+
+def main(argv=None):
+    """Función principal del CLI."""
+    args = construir_parser().parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
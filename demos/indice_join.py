@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Índices de Join Precalculados entre Proyectos, Gastos y Ventas
+==============================================================
+
+``proyecto_id`` une ``proyectos_completo.csv`` con la hoja
+``Gastos_Detallados`` de ``tiempos_gastos.xlsx`` y ``cliente`` une
+proyectos con ``ventas_detallado.csv``. Cada ``merge`` vuelve a hashear
+ambos lados. Aquí cada columna clave tiene un índice que se construye una
+vez por versión del dataset:
+
+- ``codigos``: clave factorizada de cada fila
+- ``unicos``: valores distintos de la clave (``pd.Index``)
+- ``orden`` + ``inicios``: posiciones de las filas agrupadas por código
+
+Con dos índices, un join solo hashea las claves *distintas* del lado
+izquierdo contra las del derecho. El resto son gathers de NumPy. Los
+semi-joins ("gastos de proyectos en riesgo") toman directamente los
+bloques de posiciones de las claves pedidas.
+
+Los índices se guardan en ``.cache/indices/`` con la versión del archivo
+fuente (tamaño y fecha de modificación) y la huella de la columna clave en
+el nombre: si el frame se reordena o filtra tras cargarlo, no se reutilizan
+posiciones de otra versión. Las fuentes se pueden cargar en paralelo con un
+pool de hilos.
+
+Ejemplo:
+    fuentes = cargar_fuentes(FUENTES)
+    idx_gastos = indice_persistido('gastos', fuentes['gastos'], 'proyecto_id',
+                                   FUENTES['gastos'].ruta)
+    gastos_riesgo = idx_gastos.semi_join(fuentes['gastos'], riesgo['proyecto_id'])
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import hashlib
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# ÍNDICE
+# ============================================================================
+
+class IndiceJoin:
+    """Clave factorizada y posiciones de filas agrupadas por clave."""
+
+    def __init__(self, codigos, unicos, columna=None):
+        self.columna = columna
+        self.codigos = codigos
+        self.unicos = unicos
+        # Ordenamiento por conteo (estable) de las filas según su código
+        self.tamanos = np.bincount(codigos[codigos >= 0], minlength=len(unicos))
+        self.inicios = np.concatenate(([0], np.cumsum(self.tamanos)[:-1])).astype(np.int64)
+        self.orden = np.argsort(codigos[codigos >= 0], kind='stable')
+        self.orden = np.flatnonzero(codigos >= 0)[self.orden]
+
+    @classmethod
+    def construir(cls, serie):
+        """Índice de una columna clave (los nulos no participan en joins)."""
+        codigos, unicos = pd.factorize(serie)
+        return cls(codigos.astype(np.int64), pd.Index(unicos), serie.name)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    # ------------------------------------------------------------------
+    # Persistencia (solo arreglos: no depende de cómo se importó la clase)
+    # ------------------------------------------------------------------
+
+    _ARREGLOS = ('codigos', 'tamanos', 'inicios', 'orden')
+
+    def guardar(self, archivo):
+        """Escribe el índice como arreglos NumPy (``.npz``)."""
+        np.savez(archivo, unicos=np.asarray(self.unicos, dtype=object),
+                 columna=np.asarray([self.columna], dtype=object),
+                 **{nombre: getattr(self, nombre) for nombre in self._ARREGLOS})
+
+    @classmethod
+    def cargar(cls, archivo):
+        """Reconstruye un índice escrito con ``guardar`` sin recalcular el orden."""
+        with np.load(archivo, allow_pickle=True) as datos:
+            indice = cls.__new__(cls)
+            indice.columna = datos['columna'][0]
+            indice.unicos = pd.Index(datos['unicos'])
+            for nombre in cls._ARREGLOS:
+                setattr(indice, nombre, datos[nombre])
+        return indice
+
+    # ------------------------------------------------------------------
+    # Resolución de claves
+    # ------------------------------------------------------------------
+
+    def codigos_de(self, claves):
+        """Código de cada clave en este índice (-1 si no existe)."""
+        return self.unicos.get_indexer(pd.Index(claves))
+
+    def traducir(self, otro):
+        """Códigos de ``otro`` expresados en este índice: hashea solo las claves distintas."""
+        return np.append(self.codigos_de(otro.unicos), -1)[otro.codigos]
+
+    def _expandir(self, codigos):
+        """Para cada código, las posiciones de sus filas; devuelve (repeticiones, posiciones)."""
+        validos = codigos >= 0
+        conteo = np.where(validos, self.tamanos[np.where(validos, codigos, 0)], 0)
+        inicio = np.repeat(self.inicios[np.where(validos, codigos, 0)], conteo)
+        desplazamiento = np.arange(conteo.sum()) - np.repeat(np.cumsum(conteo) - conteo, conteo)
+        return conteo, self.orden[inicio + desplazamiento]
+
+    # ------------------------------------------------------------------
+    # Joins
+    # ------------------------------------------------------------------
+
+    def semi_join(self, df, claves):
+        """Filas de ``df`` (el frame indexado) cuya clave está en ``claves``."""
+        codigos = self.codigos_de(pd.unique(pd.Series(claves).dropna()))
+        _, posiciones = self._expandir(codigos[codigos >= 0])
+        return df.iloc[np.sort(posiciones)]
+
+    def anti_join(self, df, claves):
+        """Filas de ``df`` (el frame indexado) cuya clave NO está en ``claves``."""
+        codigos = self.codigos_de(pd.unique(pd.Series(claves).dropna()))
+        excluir = np.zeros(len(self.unicos) + 1, dtype=bool)
+        excluir[codigos[codigos >= 0]] = True
+        return df.iloc[np.flatnonzero(~excluir[self.codigos])]
+
+    def join(self, derecha, izquierda, indice_izquierda, how='inner', sufijos=('', '_der')):
+        """
+        Une ``izquierda`` (con su índice) contra ``derecha`` (el frame de este índice).
+
+        ``how`` puede ser ``'inner'`` o ``'left'``. La columna clave de la
+        derecha se omite del resultado, como en ``merge(on=...)``.
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError("how debe ser 'inner' o 'left'")
+        codigos = self.traducir(indice_izquierda)
+        conteo, posiciones_der = self._expandir(codigos)
+        if how == 'left':
+            sin_pareja = conteo == 0
+            conteo = np.where(sin_pareja, 1, conteo)
+            # Inserta -1 (sin fila derecha) donde la izquierda no tiene pareja
+            destino = np.full(conteo.sum(), -1, dtype=np.int64)
+            con_pareja = np.repeat(~sin_pareja, conteo)
+            destino[con_pareja] = posiciones_der
+            posiciones_der = destino
+        posiciones_izq = np.repeat(np.arange(len(izquierda)), conteo)
+
+        parte_izq = izquierda.iloc[posiciones_izq].reset_index(drop=True)
+        columnas_der = [c for c in derecha.columns
+                        if not (c == self.columna and c == indice_izquierda.columna)]
+        faltantes = posiciones_der < 0
+        parte_der = derecha[columnas_der].iloc[np.where(faltantes, 0, posiciones_der)]
+        parte_der = parte_der.reset_index(drop=True)
+        if faltantes.any():
+            parte_der = parte_der.mask(pd.Series(faltantes), axis=0)
+        repetidas = parte_izq.columns.intersection(parte_der.columns)
+        parte_izq = parte_izq.rename(columns={c: f'{c}{sufijos[0]}' for c in repetidas})
+        parte_der = parte_der.rename(columns={c: f'{c}{sufijos[1]}' for c in repetidas})
+        return pd.concat([parte_izq, parte_der], axis=1)
+
+# ============================================================================
+# PERSISTENCIA POR VERSIÓN
+# ============================================================================
+
+DIRECTORIO_INDICES = os.path.join('.cache', 'indices')
+
+
+def version_archivo(ruta):
+    """Huella barata de la versión de un archivo: ruta, tamaño y fecha de modificación."""
+    estado = os.stat(ruta)
+    firma = f'{os.path.abspath(ruta)}|{estado.st_size}|{estado.st_mtime_ns}'
+    return hashlib.sha1(firma.encode()).hexdigest()[:12]
+
+
+def huella_columna(serie):
+    """Huella de los valores de ``serie`` en su orden actual (las posiciones importan)."""
+    hashes = pd.util.hash_pandas_object(serie, index=False).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()[:12]
+
+
+def indice_persistido(nombre, df, columna, ruta_fuente, directorio=DIRECTORIO_INDICES):
+    """
+    Carga el índice de ``columna`` para la versión actual de la fuente o lo construye.
+
+    La huella de la columna forma parte de la clave: un frame ordenado o
+    filtrado después de leerlo obtiene su propio índice.
+    """
+    version = f'{version_archivo(ruta_fuente)}_{huella_columna(df[columna])}'
+    ruta = os.path.join(directorio, f'{nombre}_{columna}_{version}.npz')
+    if os.path.exists(ruta):
+        try:
+            return IndiceJoin.cargar(ruta)
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError):
+            pass  # Archivo dañado o de otro formato: se reconstruye
+    indice = IndiceJoin.construir(df[columna])
+    os.makedirs(directorio, exist_ok=True)
+    temporal = f'{ruta}.{os.getpid()}.tmp'
+    with open(temporal, 'wb') as archivo:
+        indice.guardar(archivo)
+    os.replace(temporal, ruta)
+    return indice
+
+# ============================================================================
+# CARGA CONCURRENTE DE FUENTES
+# ============================================================================
+
+class Fuente:
+    """Archivo de datos y la forma de leerlo."""
+
+    def __init__(self, ruta, lector=pd.read_csv, **kwargs):
+        self.ruta = ruta
+        self.lector = lector
+        self.kwargs = kwargs
+
+    def cargar(self):
+        return self.lector(self.ruta, **self.kwargs)
+
+
+FUENTES = {
+    'proyectos': Fuente('datos/proyectos_completo.csv'),
+    'gastos': Fuente('datos/tiempos_gastos.xlsx', pd.read_excel, sheet_name='Gastos_Detallados'),
+    'ventas': Fuente('datos/ventas_detallado.csv'),
+}
+
+
+def cargar_fuentes(fuentes=FUENTES, max_hilos=None):
+    """Carga todas las fuentes en paralelo (el parseo de CSV/Excel libera el GIL en parte)."""
+    with ThreadPoolExecutor(max_workers=max_hilos or len(fuentes)) as ejecutor:
+        futuros = {nombre: ejecutor.submit(fuente.cargar) for nombre, fuente in fuentes.items()}
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def main():
+    """Gastos de proyectos en riesgo y join proyectos-ventas reutilizando índices."""
+    datos = cargar_fuentes()
+    proyectos, gastos, ventas = datos['proyectos'], datos['gastos'], datos['ventas']
+    print(f"✓ Fuentes cargadas: { {n: len(df) for n, df in datos.items()} }")
+
+    idx_proy = indice_persistido('proyectos', proyectos, 'proyecto_id', FUENTES['proyectos'].ruta)
+    idx_gastos = indice_persistido('gastos', gastos, 'proyecto_id', FUENTES['gastos'].ruta)
+    idx_proy_cliente = indice_persistido('proyectos', proyectos, 'cliente', FUENTES['proyectos'].ruta)
+    idx_ventas = indice_persistido('ventas', ventas, 'cliente', FUENTES['ventas'].ruta)
+
+    print("\n1. GASTOS DE PROYECTOS EN RIESGO (semi-join):")
+    print("-" * 47)
+    riesgo = proyectos[
+        ((proyectos['gastado'] / proyectos['presupuesto']) > 1.1) |
+        (proyectos['satisfaccion'] < 7.0)
+    ]
+    gastos_riesgo = idx_gastos.semi_join(gastos, riesgo['proyecto_id'])
+    referencia = gastos[gastos['proyecto_id'].isin(riesgo['proyecto_id'])]
+    print(f"Proyectos en riesgo: {list(riesgo['proyecto_id'])}")
+    print(f"Gastos asociados: {len(gastos_riesgo)} (isin: {len(referencia)})")
+    print(gastos_riesgo.groupby('proyecto_id')['monto'].sum().round(2))
+
+    print("\n2. PROYECTOS × GASTOS (join con índices en ambos lados):")
+    print("-" * 55)
+    unido = idx_gastos.join(gastos, proyectos, idx_proy)
+    esperado = proyectos.merge(gastos, on='proyecto_id', suffixes=('', '_der'))
+    print(f"Filas: {len(unido)} (merge: {len(esperado)})")
+
+    print("\n3. PROYECTOS × VENTAS POR CLIENTE (left join):")
+    print("-" * 47)
+    unido = idx_ventas.join(ventas, proyectos, idx_proy_cliente, how='left')
+    esperado = proyectos.merge(ventas, on='cliente', how='left', suffixes=('', '_der'))
+    print(f"Filas: {len(unido)} (merge: {len(esperado)})")
+    print(unido[['proyecto_id', 'cliente', 'venta_id', 'producto']].head())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Perfilado por Etapas: Tiempo, CPU, Memoria y Filas
+==================================================
+
+Instrumentación ligera para las etapas de los demos y de los análisis
+de producción. Cada etapa registra:
+
+- Tiempo de pared y tiempo de CPU
+- Pico de memoria asignada (tracemalloc). El pico es del proceso: con
+  etapas simultáneas en varios hilos incluye lo que asignen los demás
+- Filas de entrada y de salida
+
+El perfilado se activa con la variable de entorno ``MERIDIAN_PERFILADO=1``.
+Cuando está desactivado, el decorador devuelve la función original y el
+context manager no mide nada, por lo que el costo es prácticamente nulo.
+tracemalloc solo está activo mientras hay alguna etapa en curso.
+
+Al terminar el proceso se escriben dos archivos en el directorio
+``MERIDIAN_PERFILADO_DIR`` (por defecto ``perfilado/``):
+
+- ``etapas.json``: registros estructurados por etapa
+- ``trace.json``: formato Chrome Trace (abrir en chrome://tracing o Perfetto)
+
+Uso:
+    @etapa('filtrado')
+    def filtrar(df): ...
+
+    with etapa('agregacion', filas_entrada=len(df)) as registro:
+        resultado = df.groupby('cliente').sum()
+        registro.filas_salida = len(resultado)
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# ============================================================================
+# CONFIGURACIÓN
+# ============================================================================
+
+VARIABLE_ACTIVACION = 'MERIDIAN_PERFILADO'
+VARIABLE_DIRECTORIO = 'MERIDIAN_PERFILADO_DIR'
+DIRECTORIO_DEFECTO = 'perfilado'
+
+ACTIVO = os.environ.get(VARIABLE_ACTIVACION, '').strip().lower() not in ('', '0', 'false', 'no')
+
+_REGISTROS = []
+_CANDADO = threading.Lock()
+_PILAS = threading.local()
+_ORIGEN_NS = time.perf_counter_ns()
+_EN_CURSO = []          # Etapas en curso en todos los hilos
+_TRAZA_PROPIA = False   # tracemalloc lo inició este módulo
+
+# ============================================================================
+# REGISTRO DE UNA ETAPA
+# ============================================================================
+
+class RegistroEtapa:
+    """Mediciones de una ejecución de etapa."""
+
+    __slots__ = ('nombre', 'filas_entrada', 'filas_salida', 'inicio_us', 'duracion_us',
+                 'cpu_s', 'pico_bytes', 'hilo', 'profundidad',
+                 '_t0', '_cpu0', '_base', '_pico')
+
+    def __init__(self, nombre, filas_entrada=None):
+        self.nombre = nombre
+        self.filas_entrada = filas_entrada
+        self.filas_salida = None
+        self.inicio_us = 0.0
+        self.duracion_us = 0.0
+        self.cpu_s = 0.0
+        self.pico_bytes = 0
+        self.hilo = threading.get_ident()
+        self.profundidad = 0
+
+    def a_dict(self):
+        """Representación serializable a JSON."""
+        return {
+            'etapa': self.nombre,
+            'inicio_us': round(self.inicio_us, 1),
+            'tiempo_pared_s': round(self.duracion_us / 1e6, 6),
+            'tiempo_cpu_s': round(self.cpu_s, 6),
+            'pico_memoria_bytes': self.pico_bytes,
+            'filas_entrada': self.filas_entrada,
+            'filas_salida': self.filas_salida,
+            'hilo': self.hilo,
+            'profundidad': self.profundidad,
+        }
+
+
+def _pila():
+    pila = getattr(_PILAS, 'pila', None)
+    if pila is None:
+        pila = _PILAS.pila = []
+    return pila
+
+
+def _acumular_pico():
+    """Traslada el pico actual a todas las etapas en curso (con ``_CANDADO`` tomado)."""
+    actual, pico = tracemalloc.get_traced_memory()
+    for registro in _EN_CURSO:
+        registro._pico = max(registro._pico, pico)
+    return actual
+
+
+def _iniciar(registro):
+    global _TRAZA_PROPIA
+    pila = _pila()
+    with _CANDADO:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _TRAZA_PROPIA = True
+        # reset_peak es global: antes se conserva el pico de las etapas de todos los hilos
+        actual = _acumular_pico()
+        tracemalloc.reset_peak()
+        registro._base = actual
+        registro._pico = actual
+        _EN_CURSO.append(registro)
+    registro.profundidad = len(pila)
+    pila.append(registro)
+    registro._cpu0 = time.thread_time()
+    registro._t0 = time.perf_counter_ns()
+
+
+def _finalizar(registro):
+    global _TRAZA_PROPIA
+    t1 = time.perf_counter_ns()
+    cpu1 = time.thread_time()
+    _pila().pop()
+    registro.inicio_us = (registro._t0 - _ORIGEN_NS) / 1e3
+    registro.duracion_us = (t1 - registro._t0) / 1e3
+    registro.cpu_s = cpu1 - registro._cpu0
+    with _CANDADO:
+        _acumular_pico()
+        _EN_CURSO.remove(registro)
+        registro.pico_bytes = registro._pico - registro._base
+        _REGISTROS.append(registro)
+        # tracemalloc encarece cada asignación: no se deja activo entre etapas
+        if not _EN_CURSO and _TRAZA_PROPIA:
+            tracemalloc.stop()
+            _TRAZA_PROPIA = False
+
+
+@contextlib.contextmanager
+def _medir(registro):
+    _iniciar(registro)
+    try:
+        yield registro
+    finally:
+        _finalizar(registro)
+
+
+def _contar_filas(obj):
+    """Número de filas de un DataFrame/Series/array, o None si no aplica."""
+    forma = getattr(obj, 'shape', None)
+    if forma:
+        return int(forma[0])
+    return None
+
+# ============================================================================
+# API PÚBLICA
+# ============================================================================
+
+class _Etapa:
+    """Decorador y context manager de una etapa instrumentada."""
+
+    def __init__(self, nombre, filas_entrada=None):
+        self.nombre = nombre
+        self.filas_entrada = filas_entrada
+
+    def __call__(self, funcion):
+        nombre = self.nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            filas = next((n for n in map(_contar_filas, args) if n is not None), None)
+            with _medir(RegistroEtapa(nombre, filas)) as registro:
+                resultado = funcion(*args, **kwargs)
+                registro.filas_salida = _contar_filas(resultado)
+            return resultado
+
+        return envoltura
+
+    # Sin estado en la instancia: la misma etapa se puede anidar o usar en
+    # varios hilos; el registro en curso es el tope de la pila del hilo.
+    # Los picos de memoria siguen siendo del proceso (ver docstring del módulo)
+    def __enter__(self):
+        registro = RegistroEtapa(self.nombre, self.filas_entrada)
+        _iniciar(registro)
+        return registro
+
+    def __exit__(self, *exc):
+        _finalizar(_pila()[-1])
+        return False
+
+
+class _EtapaInactiva:
+    """Variante sin costo cuando el perfilado está desactivado."""
+
+    __slots__ = ()
+
+    def __call__(self, funcion):
+        return funcion
+
+    def __enter__(self):
+        return _REGISTRO_NULO
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _RegistroNulo:
+    """Acepta asignaciones (p. ej. ``filas_salida``) y las descarta."""
+
+    __slots__ = ()
+
+    def __setattr__(self, nombre, valor):
+        pass
+
+
+_REGISTRO_NULO = _RegistroNulo()
+_INACTIVA = _EtapaInactiva()
+
+
+def etapa(nombre=None, filas_entrada=None):
+    """
+    Instrumenta una etapa como decorador o como context manager.
+
+    Como decorador, las filas de entrada se toman del primer argumento con
+    ``shape`` y las de salida del valor retornado.
+    """
+    if not ACTIVO:
+        return nombre if callable(nombre) else _INACTIVA
+    if callable(nombre):
+        return _Etapa(None)(nombre)
+    return _Etapa(nombre, filas_entrada)
+
+
+def registros():
+    """Copia de los registros acumulados como lista de diccionarios."""
+    with _CANDADO:
+        return [r.a_dict() for r in _REGISTROS]
+
+
+def limpiar():
+    """Descarta los registros acumulados."""
+    with _CANDADO:
+        _REGISTROS.clear()
+
+
+def exportar_json(ruta):
+    """Escribe los registros en formato JSON estructurado."""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'etapas': registros()}, f, ensure_ascii=False, indent=2)
+
+
+def exportar_chrome_trace(ruta):
+    """Escribe los registros en formato Chrome Trace (eventos completos 'X')."""
+    pid = os.getpid()
+    eventos = [
+        {
+            'name': r['etapa'],
+            'cat': 'etapa',
+            'ph': 'X',
+            'ts': r['inicio_us'],
+            'dur': round(r['tiempo_pared_s'] * 1e6, 1),
+            'pid': pid,
+            'tid': r['hilo'],
+            'args': {
+                'tiempo_cpu_s': r['tiempo_cpu_s'],
+                'pico_memoria_bytes': r['pico_memoria_bytes'],
+                'filas_entrada': r['filas_entrada'],
+                'filas_salida': r['filas_salida'],
+            },
+        }
+        for r in registros()
+    ]
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f)
+
+
+def exportar(directorio=None):
+    """Escribe ``etapas.json`` y ``trace.json`` en el directorio indicado."""
+    directorio = directorio or os.environ.get(VARIABLE_DIRECTORIO, DIRECTORIO_DEFECTO)
+    os.makedirs(directorio, exist_ok=True)
+    exportar_json(os.path.join(directorio, 'etapas.json'))
+    exportar_chrome_trace(os.path.join(directorio, 'trace.json'))
+    return directorio
+
+
+def _exportar_al_salir():
+    if _REGISTROS:
+        directorio = exportar()
+        print(f"✓ Perfilado de {len(_REGISTROS)} etapas escrito en {directorio}/")
+
+
+if ACTIVO:
+    atexit.register(_exportar_al_salir)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Servicio de Consultas Asyncio sobre el Dataset de Proyectos
+===========================================================
+
+Servicio HTTP local y de larga duración que mantiene el dataset en memoria
+y responde las consultas estilo demo 01 (detección de riesgo, portafolio por
+cliente, filtros por rango, agrupaciones) sin lanzar un proceso por petición.
+
+- El bucle asyncio solo hace E/S; el trabajo de Pandas se ejecuta en un
+  ``ThreadPoolExecutor`` acotado
+- Las consultas en curso tienen un tope; al superarlo se responde 503
+- Conexiones keep-alive (HTTP/1.1) para clientes de dashboards
+- Caché de resultados opcional (``--cache-mb``, ver ``cache_resultados.py``)
+- Las condiciones se expresan como datos (``[columna, operador, valor]``),
+  nunca como código evaluado
+
+Endpoints:
+    GET  /salud      Estado del servicio y tamaño del dataset
+    POST /consulta   Cuerpo JSON, por ejemplo:
+        {"tipo": "filtro", "condiciones": [["presupuesto", ">", 150000],
+                                            ["estado", "==", "En Progreso"]],
+         "columnas": ["proyecto_id", "cliente"], "limite": 10}
+        {"tipo": "agrupar", "por": ["cliente"], "agregaciones": {"presupuesto": "sum"}}
+        {"tipo": "riesgo"}
+        {"tipo": "portafolio"}
+
+Uso:
+    python demos/servicio_consultas.py --puerto 8765 --n-proyectos 100000
+    python demos/carga_servicio.py --puerto 8765 --clientes 32
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from cache_resultados import CacheResultados, DatasetVersionado, normalizar_expresion
+
+# ============================================================================
+# CONSULTAS (se ejecutan en el pool de hilos)
+# ============================================================================
+
+OPERADORES = {
+    '==': lambda s, v: s == v,
+    '!=': lambda s, v: s != v,
+    '>': lambda s, v: s > v,
+    '>=': lambda s, v: s >= v,
+    '<': lambda s, v: s < v,
+    '<=': lambda s, v: s <= v,
+    'in': lambda s, v: s.isin(v),
+    'between': lambda s, v: s.between(v[0], v[1]),
+    'contains': lambda s, v: s.str.contains(v, case=False, regex=False, na=False),
+}
+AGREGACIONES = {'count', 'sum', 'mean', 'median', 'min', 'max', 'std', 'nunique'}
+LIMITE_FILAS = 1000
+MAX_CUERPO = 1 << 20    # Bytes aceptados en el cuerpo de una petición
+
+
+class ErrorConsulta(ValueError):
+    """Consulta mal formada; se responde con 400."""
+
+
+def _mascara(df, condiciones):
+    mascara = pd.Series(True, index=df.index)
+    for condicion in condiciones or []:
+        try:
+            columna, operador, valor = condicion
+        except (TypeError, ValueError):
+            raise ErrorConsulta(f"Condición inválida: {condicion!r}")
+        if columna not in df.columns:
+            raise ErrorConsulta(f"Columna desconocida: {columna!r}")
+        if operador not in OPERADORES:
+            raise ErrorConsulta(f"Operador no soportado: {operador!r}")
+        if operador == 'contains' and not (pd.api.types.is_string_dtype(df[columna])
+                                           and isinstance(valor, str)):
+            raise ErrorConsulta(f"'contains' requiere una columna y un valor de texto: {columna!r}")
+        if operador == 'in' and not isinstance(valor, list):
+            raise ErrorConsulta("'in' requiere una lista de valores")
+        if operador == 'between' and not (isinstance(valor, list) and len(valor) == 2):
+            raise ErrorConsulta("'between' requiere una lista [mínimo, máximo]")
+        mascara &= OPERADORES[operador](df[columna], valor)
+    return mascara
+
+
+def _limite(peticion, defecto):
+    """``limite`` de la petición, entre 1 y ``LIMITE_FILAS``."""
+    limite = peticion.get('limite', defecto)
+    if isinstance(limite, bool) or not isinstance(limite, int) or limite <= 0:
+        raise ErrorConsulta("'limite' debe ser un entero positivo")
+    return min(limite, LIMITE_FILAS)
+
+
+def _registros(df):
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+def consulta_filtro(df, peticion):
+    """Filas que cumplen todas las condiciones (AND)."""
+    seleccion = df[_mascara(df, peticion.get('condiciones'))]
+    columnas = peticion.get('columnas') or list(df.columns)
+    limite = _limite(peticion, 100)
+    return {'total': int(len(seleccion)), 'filas': _registros(seleccion[columnas].head(limite))}
+
+
+def consulta_agrupar(df, peticion):
+    """groupby con agregaciones por columna sobre las filas filtradas."""
+    por = peticion.get('por') or []
+    agregaciones = peticion.get('agregaciones') or {}
+    if not por or not agregaciones:
+        raise ErrorConsulta("'agrupar' requiere 'por' y 'agregaciones'")
+    desconocidas = [c for c in list(por) + list(agregaciones) if c not in df.columns]
+    if desconocidas:
+        raise ErrorConsulta(f"Columnas desconocidas: {desconocidas}")
+    if not set(agregaciones.values()) <= AGREGACIONES:
+        raise ErrorConsulta(f"Agregaciones soportadas: {sorted(AGREGACIONES)}")
+    seleccion = df[_mascara(df, peticion.get('condiciones'))]
+    resultado = seleccion.groupby(por).agg(agregaciones).round(2).reset_index()
+    return {'grupos': _registros(resultado)}
+
+
+def consulta_riesgo(df, peticion):
+    """Proyectos de riesgo del demo 01 (sobrecosto, baja satisfacción, duración)."""
+    riesgo = df[
+        ((df['gastado'] / df['presupuesto']) > 1.1) |
+        (df['satisfaccion'] < 6.0) |
+        ((df['estado'] == 'En Progreso') & (df['duracion_meses'] > 8))
+    ]
+    limite = _limite(peticion, 20)
+    columnas = ['proyecto_id', 'cliente', 'presupuesto', 'gastado', 'satisfaccion', 'estado']
+    return {'total': int(len(riesgo)), 'filas': _registros(riesgo[columnas].head(limite))}
+
+
+def consulta_portafolio(df, peticion):
+    """Portafolio activo por cliente del demo 01."""
+    estados = peticion.get('estados', ['En Progreso', 'Planificación'])
+    activos = df[df['estado'].isin(estados)]
+    portafolio = activos.groupby('cliente').agg(
+        Num_Proyectos=('proyecto_id', 'count'),
+        Presupuesto_Total=('presupuesto', 'sum'),
+        Satisfaccion_Promedio=('satisfaccion', 'mean'),
+    ).round(2).reset_index()
+    return {'clientes': _registros(portafolio)}
+
+
+CONSULTAS = {
+    'filtro': consulta_filtro,
+    'agrupar': consulta_agrupar,
+    'riesgo': consulta_riesgo,
+    'portafolio': consulta_portafolio,
+}
+
+
+FORMATOS_CONDICION = {
+    'between': '{columna}.between(*{valor!r})',
+    'contains': '{columna}.str.contains({valor!r})',
+}
+
+
+def clave_peticion(peticion):
+    """
+    Clave de caché: las condiciones se escriben como una expresión AND y se
+    normalizan con ``normalizar_expresion``, así su orden no importa.
+    """
+    if not isinstance(peticion, dict):
+        raise ErrorConsulta("La petición debe ser un objeto JSON")
+    clausulas = []
+    for condicion in peticion.get('condiciones') or []:
+        try:
+            columna, operador, valor = condicion
+        except (TypeError, ValueError):
+            raise ErrorConsulta(f"Condición inválida: {condicion!r}")
+        formato = FORMATOS_CONDICION.get(operador, '{columna} {operador} {valor!r}')
+        clausulas.append(f'({formato.format(columna=columna, operador=operador, valor=valor)})')
+    filtro = normalizar_expresion(' & '.join(clausulas)) if clausulas else ''
+    resto = {k: v for k, v in peticion.items() if k != 'condiciones'}
+    return filtro, json.dumps(resto, sort_keys=True, ensure_ascii=False)
+
+
+def ejecutar_consulta(df, peticion):
+    """Despacha una petición ya decodificada."""
+    if not isinstance(peticion, dict) or peticion.get('tipo') not in CONSULTAS:
+        raise ErrorConsulta(f"'tipo' debe ser uno de {sorted(CONSULTAS)}")
+    return CONSULTAS[peticion['tipo']](df, peticion)
+
+# ============================================================================
+# SERVIDOR HTTP MÍNIMO
+# ============================================================================
+
+ESTADOS_HTTP = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ServicioConsultas:
+    """Servidor asyncio con el dataset residente y un pool de hilos acotado."""
+
+    def __init__(self, df, hilos=None, max_en_curso=None, cache=None):
+        self.datos = DatasetVersionado(df)
+        self.cache = cache
+        self.hilos = hilos or min(8, os.cpu_count() or 1)
+        self.ejecutor = ThreadPoolExecutor(max_workers=self.hilos)
+        self.max_en_curso = max_en_curso or self.hilos * 16
+        self.en_curso = 0
+        self.atendidas = 0
+
+    async def _responder(self, escritor, estado, cuerpo, mantener):
+        datos = json.dumps(cuerpo, ensure_ascii=False, default=str).encode('utf-8')
+        cabecera = (
+            f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(datos)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        ).encode('ascii')
+        escritor.write(cabecera + datos)
+        await escritor.drain()
+
+    def _consultar(self, peticion):
+        datos = self.datos
+        if self.cache is None:
+            return ejecutar_consulta(datos.df, peticion)
+        # La versión se lee antes que el frame: si se cruza un reemplazar(), el
+        # resultado queda bajo la versión vieja y la caché lo descarta
+        version, df = datos.version, datos.df
+        return self.cache.obtener(datos.id, version, clave_peticion(peticion),
+                                  lambda: ejecutar_consulta(df, peticion))
+
+    async def _procesar(self, metodo, ruta, cuerpo):
+        if metodo == 'GET' and ruta == '/salud':
+            salud = {'estado': 'ok', 'filas': len(self.datos.df), 'hilos': self.hilos,
+                     'en_curso': self.en_curso, 'atendidas': self.atendidas}
+            if self.cache is not None:
+                salud['cache'] = self.cache.estadisticas()
+            return 200, salud
+        if metodo != 'POST' or ruta != '/consulta':
+            return 404, {'error': f'{metodo} {ruta} no existe'}
+        if self.en_curso >= self.max_en_curso:
+            return 503, {'error': 'Servicio saturado, reintente'}
+        try:
+            peticion = json.loads(cuerpo or b'{}')
+        except json.JSONDecodeError as error:
+            return 400, {'error': f'JSON inválido: {error}'}
+
+        self.en_curso += 1
+        try:
+            bucle = asyncio.get_running_loop()
+            resultado = await bucle.run_in_executor(
+                self.ejecutor, self._consultar, peticion
+            )
+            return 200, resultado
+        except (ErrorConsulta, KeyError, TypeError, ValueError) as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            # Cualquier otro fallo se responde en vez de cortar la conexión
+            traceback.print_exc()
+            return 500, {'error': f'Error interno: {type(error).__name__}: {error}'}
+        finally:
+            self.en_curso -= 1
+            self.atendidas += 1
+
+    async def atender(self, lector, escritor):
+        """Atiende una conexión (varias peticiones si es keep-alive)."""
+        try:
+            while True:
+                try:
+                    cabecera = await lector.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionResetError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._responder(escritor, 400, {'error': 'Cabeceras demasiado largas'}, False)
+                    break
+                lineas = cabecera.decode('latin-1').split('\r\n')
+                metodo, ruta, version = (lineas[0].split(' ') + ['', '', ''])[:3]
+                cabeceras = {}
+                for linea in lineas[1:]:
+                    if ':' in linea:
+                        nombre, valor = linea.split(':', 1)
+                        cabeceras[nombre.strip().lower()] = valor.strip()
+                try:
+                    largo = int(cabeceras.get('content-length', 0) or 0)
+                except ValueError:
+                    largo = -1
+                if not 0 <= largo <= MAX_CUERPO:
+                    # Sin un largo válido no se sabe dónde empieza la próxima petición
+                    await self._responder(escritor, 400, {
+                        'error': f'Content-Length inválido (máximo {MAX_CUERPO} bytes)'
+                    }, False)
+                    break
+                try:
+                    cuerpo = await lector.readexactly(largo) if largo else b''
+                except (asyncio.IncompleteReadError, ConnectionResetError):
+                    break
+                mantener = (cabeceras.get('connection', '').lower() != 'close'
+                            and version == 'HTTP/1.1')
+
+                estado, respuesta = await self._procesar(metodo, ruta, cuerpo)
+                await self._responder(escritor, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        finally:
+            escritor.close()
+
+    async def servir(self, host='127.0.0.1', puerto=8765):
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        print(f"✓ Servicio escuchando en http://{host}:{puerto} "
+              f"({len(self.datos.df):,} filas, {self.hilos} hilos)")
+        async with servidor:
+            await servidor.serve_forever()
+
+# ============================================================================
+# ARRANQUE
+# ============================================================================
+
+def main():
+    """Carga el dataset una vez y sirve consultas hasta Ctrl+C."""
+    parser = argparse.ArgumentParser(description='Servicio local de consultas de proyectos')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--n-proyectos', type=int, default=50_000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--hilos', type=int, default=None, help='Tamaño del pool de consultas')
+    parser.add_argument('--cache-mb', type=int, default=0,
+                        help='Caché de resultados en MB (0 = sin caché)')
+    args = parser.parse_args()
+
+    from demo_01_filtrado_avanzado import cargar_datos_demo
+    df = cargar_datos_demo(args.semilla, args.n_proyectos)
+
+    cache = CacheResultados(args.cache_mb * 1024**2) if args.cache_mb else None
+    servicio = ServicioConsultas(df, hilos=args.hilos, cache=cache)
+    try:
+        asyncio.run(servicio.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        print("\n✓ Servicio detenido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Sketch de Cuantiles Aproximados (estilo KLL)
+============================================
+
+Percentiles y medianas sin ordenar la columna completa. El sketch:
+
+- Se actualiza por chunks (``actualizar``) con operaciones vectorizadas
+- Se fusiona entre shards o procesos (``fusionar``); es serializable con pickle
+- Ocupa memoria O(k) independiente del número de filas
+- Tiene un error de rango configurable (``error=0.01`` ≈ ±1% del rango)
+
+También incluye utilidades de filtrado sobre fuentes por chunks, por ejemplo
+el "cuartil superior por presupuesto" de un CSV que nunca se carga completo:
+
+    fuente = lambda: pd.read_csv('datos/proyectos.csv', chunksize=100_000)
+    for chunk in filtrar_por_cuantil(fuente, 'presupuesto', 0.75):
+        ...
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# SKETCH KLL
+# ============================================================================
+
+# Factor de decaimiento de capacidad entre niveles (valor recomendado por KLL)
+FACTOR_CAPACIDAD = 2.0 / 3.0
+# Con k elementos el error de rango es ≈ 3.3 / k (99% de confianza)
+CONSTANTE_ERROR = 3.3
+
+
+class SketchCuantiles:
+    """
+    Sketch KLL de cuantiles aproximados.
+
+    Cada nivel ``h`` guarda elementos de peso ``2**h``. Al exceder su
+    capacidad, un nivel se ordena y se compacta: se promueve la mitad de
+    los elementos (posiciones pares o impares, al azar) al nivel superior.
+    """
+
+    def __init__(self, error=0.01, semilla=None):
+        if not 0 < error < 1:
+            raise ValueError("El error debe estar en (0, 1)")
+        self.error = error
+        self.k = max(8, math.ceil(CONSTANTE_ERROR / error))
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self._niveles = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+
+    # ------------------------------------------------------------------
+    # Actualización y fusión
+    # ------------------------------------------------------------------
+
+    def _capacidad(self, nivel):
+        altura = len(self._niveles)
+        return max(2, int(math.ceil(self.k * FACTOR_CAPACIDAD ** (altura - 1 - nivel))))
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self._niveles):
+            elementos = self._niveles[nivel]
+            if len(elementos) > self._capacidad(nivel):
+                if nivel + 1 == len(self._niveles):
+                    self._niveles.append(np.empty(0))
+                elementos = np.sort(elementos)
+                # Un elemento sobrante (si la cantidad es impar) permanece en el nivel
+                sobrante = elementos[:len(elementos) % 2]
+                pares = elementos[len(sobrante):]
+                promovidos = pares[self._rng.integers(2)::2]
+                self._niveles[nivel] = sobrante
+                self._niveles[nivel + 1] = np.concatenate((self._niveles[nivel + 1], promovidos))
+            nivel += 1
+
+    def actualizar(self, valores):
+        """Agrega un chunk de valores (array, Series o lista); ignora nulos."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return self
+        self.n += len(valores)
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        self._niveles[0] = np.concatenate((self._niveles[0], valores))
+        self._compactar()
+        return self
+
+    def fusionar(self, otro):
+        """Incorpora otro sketch (p. ej. de otro shard o proceso)."""
+        if otro.k != self.k:
+            raise ValueError(f"Sketches incompatibles: k={self.k} vs k={otro.k}")
+        while len(self._niveles) < len(otro._niveles):
+            self._niveles.append(np.empty(0))
+        for nivel, elementos in enumerate(otro._niveles):
+            self._niveles[nivel] = np.concatenate((self._niveles[nivel], elementos))
+        self.n += otro.n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._compactar()
+        return self
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _ponderados(self):
+        valores = np.concatenate(self._niveles)
+        pesos = np.concatenate([np.full(len(e), 2.0 ** h) for h, e in enumerate(self._niveles)])
+        orden = np.argsort(valores, kind='stable')
+        return valores[orden], np.cumsum(pesos[orden])
+
+    def cuantil(self, q):
+        """Valor aproximado del cuantil ``q`` (escalar o lista en [0, 1])."""
+        if self.n == 0:
+            raise ValueError("El sketch está vacío")
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Los cuantiles deben estar en [0, 1]")
+        valores, acumulado = self._ponderados()
+        posiciones = np.searchsorted(acumulado, qs * acumulado[-1], side='left')
+        resultado = valores[np.minimum(posiciones, len(valores) - 1)]
+        resultado = np.where(qs == 0, self.minimo, np.where(qs == 1, self.maximo, resultado))
+        return float(resultado[0]) if np.ndim(q) == 0 else resultado
+
+    def mediana(self):
+        """Mediana aproximada."""
+        return self.cuantil(0.5)
+
+    def rango(self, valor):
+        """Fracción aproximada de valores menores o iguales a ``valor``."""
+        if self.n == 0:
+            raise ValueError("El sketch está vacío")
+        valores, acumulado = self._ponderados()
+        posicion = np.searchsorted(valores, valor, side='right')
+        return 0.0 if posicion == 0 else float(acumulado[posicion - 1] / acumulado[-1])
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        retenidos = sum(len(e) for e in self._niveles)
+        return f"SketchCuantiles(n={self.n}, k={self.k}, retenidos={retenidos})"
+
+# ============================================================================
+# UTILIDADES SOBRE FUENTES POR CHUNKS
+# ============================================================================
+
+def sketch_de_chunks(chunks, columna, error=0.01, semilla=None):
+    """Construye un sketch recorriendo un iterable de DataFrames."""
+    sketch = SketchCuantiles(error, semilla)
+    for chunk in chunks:
+        sketch.actualizar(chunk[columna].to_numpy())
+    return sketch
+
+
+def fusionar_sketches(sketches, semilla=None):
+    """Combina los sketches de varios shards en uno nuevo (no modifica los originales)."""
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError("Se necesita al menos un sketch")
+    resultado = SketchCuantiles(sketches[0].error, semilla)
+    for sketch in sketches:
+        resultado.fusionar(sketch)
+    return resultado
+
+
+def filtrar_por_cuantil(fuente, columna, q, superior=True, error=0.01, sketch=None):
+    """
+    Filtra por un umbral de cuantil sin cargar la fuente completa.
+
+    ``fuente`` es un callable que devuelve un iterable nuevo de DataFrames
+    (p. ej. ``lambda: pd.read_csv(ruta, chunksize=...)``). Se hace una pasada
+    para construir el sketch (omitida si se pasa ``sketch``) y se devuelve un
+    generador de chunks filtrados con ``>= umbral`` (o ``<=`` si
+    ``superior=False``).
+    """
+    if sketch is None:
+        sketch = sketch_de_chunks(fuente(), columna, error)
+    umbral = sketch.cuantil(q)
+    if superior:
+        return (chunk[chunk[columna] >= umbral] for chunk in fuente())
+    return (chunk[chunk[columna] <= umbral] for chunk in fuente())
+
+
+def cuartil_superior(fuente, columna='presupuesto', error=0.01):
+    """Filas en el cuartil superior de ``columna`` (equivalente a ``>= p75``)."""
+    return pd.concat(filtrar_por_cuantil(fuente, columna, 0.75, True, error), ignore_index=True)
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def main():
+    """Compara el sketch contra cuantiles exactos sobre datos por shards."""
+    n_shards, filas_por_chunk, chunks_por_shard = 4, 250_000, 4
+
+    def generar_shard(indice):
+        rng_shard = np.random.default_rng(indice)
+        for _ in range(chunks_por_shard):
+            yield pd.DataFrame({
+                'presupuesto': np.abs(rng_shard.normal(150000, 50000, filas_por_chunk))
+            })
+
+    print("\n1. SKETCH POR SHARD Y FUSIÓN:")
+    print("-" * 35)
+    sketches = [sketch_de_chunks(generar_shard(i), 'presupuesto', error=0.005, semilla=i)
+                for i in range(n_shards)]
+    sketch = fusionar_sketches(sketches)
+    print(sketch)
+
+    exactos = pd.concat(
+        [chunk for i in range(n_shards) for chunk in generar_shard(i)], ignore_index=True
+    )['presupuesto']
+    for q in (0.25, 0.5, 0.75, 0.99):
+        aproximado = sketch.cuantil(q)
+        exacto = exactos.quantile(q)
+        error_rango = abs((exactos <= aproximado).mean() - q)
+        print(f"  q={q:<5} aprox=${aproximado:,.0f}  exacto=${exacto:,.0f}  "
+              f"error de rango={error_rango:.4%}")
+
+    print("\n2. CUARTIL SUPERIOR SIN CARGAR LA FUENTE:")
+    print("-" * 42)
+    top = cuartil_superior(lambda: generar_shard(0))
+    print(f"Filas en el cuartil superior del shard 0: {len(top):,} "
+          f"de {filas_por_chunk * chunks_por_shard:,}")
+
+
+if __name__ == "__main__":
+    main()
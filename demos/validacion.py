@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Validación Vectorizada de Restricciones entre Columnas
+======================================================
+
+Los generadores de datos codifican invariantes que nadie verifica:
+puntuaciones entre 1 y 5, ``monto >= 100``, ``fecha_aprobacion >
+fecha_gasto``, ``aprobado_por`` vacío si y solo si el gasto no está
+aprobado, ``recomendaria`` nulo cuando ``puntuacion_general`` es nulo...
+
+Este módulo declara esas reglas y las evalúa con operaciones vectorizadas
+sobre un DataFrame o sobre un flujo de chunks. Cada regla devuelve una
+máscara de filas que la violan; el resultado guarda, por regla, el número
+de filas evaluadas, el de violaciones y una muestra de índices. Los
+resultados parciales se fusionan, así que un extracto de decenas de
+millones de filas se valida chunk a chunk (o en varios procesos) con
+memoria acotada.
+
+Ejemplo:
+    resultado = validar(gastos, REGLAS_GASTOS)
+    print(resultado.resumen())
+
+    resultado = validar_chunks(pd.read_csv(ruta, chunksize=1_000_000), reglas)
+
+Autor: Equipo Meridian Consulting
+Fecha: 2025
+"""
+
+import pandas as pd
+
+# ============================================================================
+# REGLAS
+# ============================================================================
+
+MAX_MUESTRAS = 5
+
+
+class Regla:
+    """
+    Restricción con nombre sobre un DataFrame.
+
+    ``violaciones`` es una función ``df -> máscara booleana`` que marca las
+    filas que NO cumplen la regla.
+    """
+
+    def __init__(self, nombre, violaciones, descripcion=''):
+        self.nombre = nombre
+        self.violaciones = violaciones
+        self.descripcion = descripcion
+
+    def __repr__(self):
+        return f"Regla({self.nombre!r})"
+
+
+def _vacio(serie):
+    """Nulo o texto vacío/en blanco."""
+    if pd.api.types.is_string_dtype(serie) or serie.dtype == object:
+        return serie.isna() | (serie.astype('string').str.strip() == '')
+    return serie.isna()
+
+
+def rango(columna, minimo=None, maximo=None, permitir_nulos=True):
+    """``minimo <= columna <= maximo``; los nulos violan la regla solo si no se permiten."""
+    if maximo is None:
+        etiqueta = f'{columna} >= {minimo}'
+    elif minimo is None:
+        etiqueta = f'{columna} <= {maximo}'
+    else:
+        etiqueta = f'{columna} en [{minimo}, {maximo}]'
+
+    def violaciones(df):
+        valores = df[columna]
+        fuera = pd.Series(False, index=df.index)
+        if minimo is not None:
+            fuera |= valores < minimo
+        if maximo is not None:
+            fuera |= valores > maximo
+        return fuera | valores.isna() if not permitir_nulos else fuera.fillna(False)
+
+    return Regla(etiqueta, violaciones)
+
+
+def no_nulo(columna):
+    """La columna siempre tiene valor."""
+    return Regla(f'{columna} no nulo', lambda df: _vacio(df[columna]))
+
+
+def mayor_que(columna, referencia, estricto=True):
+    """``columna > referencia`` (o ``>=``) cuando ambas tienen valor."""
+    operador = '>' if estricto else '>='
+
+    def violaciones(df):
+        a, b = df[columna], df[referencia]
+        cumple = a > b if estricto else a >= b
+        return (a.notna() & b.notna() & ~cumple).fillna(False)
+
+    return Regla(f'{columna} {operador} {referencia}', violaciones)
+
+
+def implica(nombre, condicion, consecuencia):
+    """Si ``condicion(df)`` entonces ``consecuencia(df)``."""
+    return Regla(nombre, lambda df: condicion(df) & ~consecuencia(df))
+
+
+def equivalente(nombre, condicion_a, condicion_b):
+    """``condicion_a(df)`` si y solo si ``condicion_b(df)``."""
+    return Regla(nombre, lambda df: condicion_a(df) != condicion_b(df))
+
+
+def valores_permitidos(columna, permitidos, permitir_nulos=True):
+    """La columna solo toma valores de ``permitidos``."""
+    def violaciones(df):
+        valores = df[columna]
+        fuera = ~valores.isin(list(permitidos))
+        return fuera & valores.notna() if permitir_nulos else fuera
+
+    return Regla(f'{columna} en valores permitidos', violaciones)
+
+# ============================================================================
+# RESULTADOS FUSIONABLES
+# ============================================================================
+
+class ResultadoValidacion:
+    """Conteos y muestras de violaciones por regla; fusionable entre chunks."""
+
+    def __init__(self, max_muestras=MAX_MUESTRAS):
+        self.max_muestras = max_muestras
+        self.filas = 0
+        self.violaciones = {}
+        self.muestras = {}
+        self.errores = {}
+
+    def registrar(self, regla, mascara):
+        conteo = int(mascara.sum())
+        self.violaciones[regla.nombre] = self.violaciones.get(regla.nombre, 0) + conteo
+        muestras = self.muestras.setdefault(regla.nombre, [])
+        faltan = self.max_muestras - len(muestras)
+        if conteo and faltan > 0:
+            muestras.extend(mascara.index[mascara.to_numpy(dtype=bool)][:faltan].tolist())
+
+    def fusionar(self, otro):
+        """Incorpora el resultado de otro chunk o proceso."""
+        self.filas += otro.filas
+        for nombre, conteo in otro.violaciones.items():
+            self.violaciones[nombre] = self.violaciones.get(nombre, 0) + conteo
+            muestras = self.muestras.setdefault(nombre, [])
+            muestras.extend(otro.muestras.get(nombre, [])[:self.max_muestras - len(muestras)])
+        self.errores.update(otro.errores)
+        return self
+
+    @property
+    def valido(self):
+        return not self.errores and not any(self.violaciones.values())
+
+    def resumen(self):
+        """DataFrame con una fila por regla."""
+        filas = [
+            {
+                'regla': nombre,
+                'violaciones': conteo,
+                'pct': round(100 * conteo / self.filas, 4) if self.filas else 0.0,
+                'muestra_indices': self.muestras.get(nombre, []),
+            }
+            for nombre, conteo in self.violaciones.items()
+        ]
+        filas += [{'regla': nombre, 'violaciones': None, 'pct': None, 'muestra_indices': error}
+                  for nombre, error in self.errores.items()]
+        return pd.DataFrame(filas, columns=['regla', 'violaciones', 'pct', 'muestra_indices'])
+
+# ============================================================================
+# EVALUACIÓN
+# ============================================================================
+
+def validar(df, reglas, max_muestras=MAX_MUESTRAS):
+    """Evalúa todas las reglas sobre ``df``."""
+    resultado = ResultadoValidacion(max_muestras)
+    resultado.filas = len(df)
+    for regla in reglas:
+        try:
+            mascara = regla.violaciones(df)
+        except KeyError as error:
+            resultado.errores[regla.nombre] = f'Columna faltante: {error}'
+            continue
+        resultado.registrar(regla, pd.Series(mascara, index=df.index).fillna(True).astype(bool))
+    return resultado
+
+
+def validar_chunks(chunks, reglas, max_muestras=MAX_MUESTRAS):
+    """Evalúa las reglas chunk a chunk y fusiona los resultados parciales."""
+    resultado = ResultadoValidacion(max_muestras)
+    for chunk in chunks:
+        resultado.fusionar(validar(chunk, reglas, max_muestras))
+    return resultado
+
+# ============================================================================
+# REGLAS DE LOS GENERADORES
+# ============================================================================
+
+PREGUNTAS_ENCUESTA = ('puntuacion_general', 'comunicacion', 'tiempo_respuesta', 'calidad_servicio')
+
+REGLAS_ENCUESTAS = [
+    *(rango(columna, 1, 5) for columna in PREGUNTAS_ENCUESTA),
+    valores_permitidos('recomendaria', ['Sí', 'Tal vez', 'No', '']),
+    implica('recomendaria nulo si puntuacion_general es nula',
+            lambda df: df['puntuacion_general'].isna(),
+            lambda df: df['recomendaria'].isna()),
+]
+
+REGLAS_GASTOS = [
+    rango('monto', minimo=100, permitir_nulos=False),
+    mayor_que('fecha_aprobacion', 'fecha_gasto'),
+    equivalente('aprobado_por vacío sii no aprobado',
+                lambda df: _vacio(df['aprobado_por']),
+                lambda df: df['fecha_aprobacion'].isna()),
+    no_nulo('proyecto_id'),
+]
+
+# ============================================================================
+# DEMOSTRACIÓN
+# ============================================================================
+
+def main():
+    """Valida los archivos Excel generados y un extracto sintético por chunks."""
+    import time
+    import numpy as np
+
+    pd.set_option('display.width', None)
+    for archivo, reglas in (('datos/encuestas_satisfaccion.xlsx', REGLAS_ENCUESTAS),
+                            ('datos/tiempos_gastos.xlsx', REGLAS_GASTOS)):
+        print(f"\n{archivo}:")
+        print("-" * 45)
+        print(validar(pd.read_excel(archivo), reglas).resumen().to_string(index=False))
+
+    print("\nEXTRACTO SINTÉTICO POR CHUNKS:")
+    print("-" * 45)
+    gastos = pd.read_excel('datos/tiempos_gastos.xlsx')
+    rng = np.random.default_rng(0)
+    n_chunks, filas_chunk = 20, 1_000_000
+
+    def chunks():
+        for i in range(n_chunks):
+            chunk = gastos.sample(filas_chunk, replace=True, random_state=i).reset_index(drop=True)
+            chunk.index += i * filas_chunk
+            chunk.loc[rng.random(filas_chunk) < 1e-4, 'monto'] = 50.0
+            yield chunk
+
+    inicio = time.perf_counter()
+    resultado = validar_chunks(chunks(), REGLAS_GASTOS)
+    print(f"{resultado.filas:,} filas en {time.perf_counter() - inicio:.1f} s "
+          f"(incluye generación de los chunks)")
+    print(resultado.resumen().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()